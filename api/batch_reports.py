@@ -1,28 +1,139 @@
 from __future__ import annotations
 
-import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import accumulate
+from operator import mul
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
+from api.fs_scan import FileStat, child_file_stats
+from api.json_io import read_json, read_json_mapped
+from api.listing_index import ListingIndex
 from cbot_farm.report_schema import migrate_report_payload
 
+_MAX_LOAD_WORKERS = 8
+
+
+class BatchRow(NamedTuple):
+    batch_id: str
+    created_at: Any
+    strategy: Any
+    max_retries: Any
+    scenarios: int
+    total_reports: int
+    promoted_count: int
+    best_return_pct: Optional[float]
+
+
+def _pnl_pct(raw: Any) -> float:
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    if isinstance(raw, str):
+        try:
+            return float(raw)
+        except ValueError:
+            return 0.0
+    return 0.0
+
+
+def _coerce_summary(payload: Dict[str, Any]) -> Dict[str, Any]:
+    # Validate the summary shape once so scenario loops can trust every entry is a dict.
+    scenarios = payload.get("scenarios")
+    return {
+        "strategy": payload.get("strategy"),
+        "scenarios": [s for s in scenarios if isinstance(s, dict)] if isinstance(scenarios, list) else [],
+    }
+
+
+@lru_cache(maxsize=1024)
+def _load_summary_cached(path_str: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    # Keyed by (path, mtime_ns, size) so a rewritten summary is reparsed automatically.
+    # The returned payload is shared between callers and must be treated as read-only.
+    path = Path(path_str)
+    return migrate_report_payload(read_json_mapped(path), path=path)
+
+
+def _lttb_indices(xs: List[int], ys: List[float], threshold: int) -> List[int]:
+    """Largest-Triangle-Three-Buckets: pick `threshold` indices that keep the curve's peaks and troughs."""
+    n = len(ys)
+    if threshold >= n:
+        return list(range(n))
+    if threshold < 3:
+        # No bucket fits between the endpoints: keep the first point, then the last.
+        return [0, n - 1][: max(threshold, 0)]
+
+    bucket_size = (n - 2) / (threshold - 2)
+    keep = [0]
+    a = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        # Twice the triangle area is |cy * y + cx * x + c0|; the coefficients are fixed per bucket.
+        ax = xs[a]
+        ay = ys[a]
+        cy = ax - avg_x
+        cx = avg_y - ay
+        c0 = -cy * ay - cx * ax
+        best_idx = start
+        best_area = -1.0
+        for idx, x, y in zip(range(start, end), xs[start:end], ys[start:end]):
+            area = abs(cy * y + cx * x + c0)
+            if area > best_area:
+                best_area = area
+                best_idx = idx
+        keep.append(best_idx)
+        a = best_idx
+
+    keep.append(n - 1)
+    return keep
+
 
 class BatchReportService:
-    def __init__(self, reports_root: Path) -> None:
+    def __init__(self, reports_root: Path, index: Optional[ListingIndex] = None) -> None:
         self.reports_root = reports_root
+        self.index = index
+        self._strategy_index: Dict[str, Tuple[int, int, str]] = {}
+
+    def _load_trade_log(self, path: Path) -> Any:
+        # Schema migration never touches backtest.trade_log, so skip it (and its deep copy) here.
+        payload = read_json(path)
+        if not isinstance(payload, dict):
+            # A malformed report leaves its scenario without a curve instead of failing the batch.
+            return None
+        backtest = payload.get("backtest")
+        return backtest.get("trade_log", []) if isinstance(backtest, dict) else []
+
+    def _batch_dirs(self) -> List[FileStat]:
+        try:
+            return child_file_stats(self.reports_root, "summary.json", prefix="batch_")
+        except FileNotFoundError:
+            return []
 
-    def _load_json(self, path: Path) -> Dict[str, Any]:
-        with path.open("r", encoding="utf-8") as fh:
-            payload = json.load(fh)
-        return migrate_report_payload(payload, path=path)
+    def _load_summary(self, summary_path: Path, mtime_ns: int, size: int) -> Dict[str, Any]:
+        return _load_summary_cached(str(summary_path), mtime_ns, size)
 
-    def _batch_dirs(self) -> List[Path]:
-        dirs = [p for p in self.reports_root.glob("batch_*") if p.is_dir() and (p / "summary.json").exists()]
-        dirs.sort(key=lambda p: (p / "summary.json").stat().st_mtime, reverse=True)
-        return dirs
+    def _summary_strategy(self, batch_id: str, mtime_ns: int, size: int) -> str:
+        # Lowercased strategy per summary, kept apart from the bounded summary cache so
+        # filtered listings can skip non-matching batches without holding their payloads.
+        cached = self._strategy_index.get(batch_id)
+        if cached is not None and cached[0] == mtime_ns and cached[1] == size:
+            return cached[2]
+        payload = self._load_summary(self.reports_root / batch_id / "summary.json", mtime_ns, size)
+        strategy = str(payload.get("strategy") or "").lower()
+        self._strategy_index[batch_id] = (mtime_ns, size, strategy)
+        return strategy
 
     def _run_id_from_report_path(self, report_path: str) -> Optional[str]:
-        name = Path(report_path).name
+        name = os.path.basename(report_path)
         if not name.endswith(".json"):
             return None
         stem = name[:-5]
@@ -31,22 +142,21 @@ class BatchReportService:
         return stem
 
     def _resolve_report_path(self, report_path: str) -> Optional[Path]:
-        p = Path(report_path)
-        if p.is_absolute():
-            return p if p.exists() else None
+        if os.path.isabs(report_path):
+            return Path(report_path) if os.path.exists(report_path) else None
+
+        reports_root = str(self.reports_root)
+        project_root = os.path.dirname(reports_root)
 
         # Standard format used by batch summary artifacts.
         if report_path.startswith("reports/"):
-            candidate = self.reports_root.parent / p
-            return candidate if candidate.exists() else None
-
-        candidate = self.reports_root / p
-        if candidate.exists():
-            return candidate
+            candidate = os.path.join(project_root, report_path)
+            return Path(candidate) if os.path.exists(candidate) else None
 
-        candidate = self.reports_root.parent / p
-        if candidate.exists():
-            return candidate
+        for base in (reports_root, project_root):
+            candidate = os.path.join(base, report_path)
+            if os.path.exists(candidate):
+                return Path(candidate)
 
         return None
 
@@ -54,105 +164,107 @@ class BatchReportService:
         if not isinstance(trade_log, list) or not trade_log:
             return []
 
-        equity = 1.0
-        points: List[Dict[str, float]] = []
+        xs: List[int] = []
+        growth: List[float] = []
         for idx, trade in enumerate(trade_log, start=1):
-            if not isinstance(trade, dict):
-                continue
-
-            raw = trade.get("net_pnl_pct", 0.0)
-            if isinstance(raw, (int, float)):
-                pnl_pct = float(raw)
-            elif isinstance(raw, str):
-                try:
-                    pnl_pct = float(raw)
-                except ValueError:
-                    pnl_pct = 0.0
-            else:
-                pnl_pct = 0.0
-
-            equity *= 1.0 + (pnl_pct / 100.0)
-            points.append({"x": float(idx), "equity": round(equity, 6)})
-
-        if len(points) <= max_points:
-            return points
-
-        step = max(1, len(points) // max_points)
-        reduced = points[::step]
-        if reduced[-1] != points[-1]:
-            reduced.append(points[-1])
-        return reduced
+            if isinstance(trade, dict):
+                xs.append(idx)
+                growth.append(1.0 + _pnl_pct(trade.get("net_pnl_pct", 0.0)) / 100.0)
+        equity = list(accumulate(growth, mul))
+
+        # Pick the kept indices first so dicts are only built for the points we return.
+        if len(equity) <= max_points:
+            keep: List[int] = list(range(len(equity)))
+        else:
+            keep = _lttb_indices(xs, equity, max_points)
+
+        return [{"x": float(xs[i]), "equity": round(equity[i], 6)} for i in keep]
+
+    def _batch_row(self, batch_id: str, mtime_ns: int, size: int) -> BatchRow:
+        payload = self._load_summary(self.reports_root / batch_id / "summary.json", mtime_ns, size)
+        view = _coerce_summary(payload)
+        scenarios = view["scenarios"]
+
+        total_reports = 0
+        promoted_count = 0
+        best_return_values: List[float] = []
+
+        for scenario in scenarios:
+            total_reports += int(scenario.get("reports", 0) or 0)
+            promoted_count += int(scenario.get("promoted_count", 0) or 0)
+            best = scenario.get("best", {})
+            metrics = best.get("metrics", {}) if isinstance(best, dict) else {}
+            raw_return = metrics.get("total_return_pct") if isinstance(metrics, dict) else None
+            if isinstance(raw_return, (int, float)):
+                best_return_values.append(float(raw_return))
+
+        return BatchRow(
+            batch_id=batch_id,
+            created_at=payload.get("created_at"),
+            strategy=view["strategy"],
+            max_retries=payload.get("max_retries"),
+            scenarios=len(scenarios),
+            total_reports=total_reports,
+            promoted_count=promoted_count,
+            best_return_pct=max(best_return_values) if best_return_values else None,
+        )
+
+    def _indexed_batch_row(self, batch_id: str, mtime_ns: int, size: int) -> Tuple[Optional[str], Dict[str, Any]]:
+        row = self._batch_row(batch_id, mtime_ns, size)
+        return str(row.strategy or "").lower(), row._asdict()
 
     def list_batches(self, limit: int = 20, offset: int = 0, strategy: Optional[str] = None) -> Dict[str, Any]:
-        items: List[Dict[str, Any]] = []
-        for batch_dir in self._batch_dirs():
-            summary_path = batch_dir / "summary.json"
-            payload = self._load_json(summary_path)
-
-            strategy_id = payload.get("strategy")
-            if strategy and str(strategy_id or "").lower() != strategy.lower():
-                continue
-
-            scenarios = payload.get("scenarios", []) if isinstance(payload.get("scenarios"), list) else []
-            total_reports = 0
-            promoted_count = 0
-            best_return_values: List[float] = []
-
-            for scenario in scenarios:
-                if not isinstance(scenario, dict):
-                    continue
-                total_reports += int(scenario.get("reports", 0) or 0)
-                promoted_count += int(scenario.get("promoted_count", 0) or 0)
-                best = scenario.get("best", {})
-                metrics = best.get("metrics", {}) if isinstance(best, dict) else {}
-                raw_return = metrics.get("total_return_pct") if isinstance(metrics, dict) else None
-                if isinstance(raw_return, (int, float)):
-                    best_return_values.append(float(raw_return))
-
-            items.append(
-                {
-                    "batch_id": batch_dir.name,
-                    "created_at": payload.get("created_at"),
-                    "strategy": strategy_id,
-                    "max_retries": payload.get("max_retries"),
-                    "scenarios": len(scenarios),
-                    "total_reports": total_reports,
-                    "promoted_count": promoted_count,
-                    "best_return_pct": max(best_return_values) if best_return_values else None,
-                }
-            )
-
-        total = len(items)
-        page = items[offset : offset + limit]
-        return {"total": total, "limit": limit, "offset": offset, "items": page}
+        needle = strategy.lower() if strategy else None
+        batch_dirs = self._batch_dirs()
 
-    def get_batch(self, batch_id: str) -> Dict[str, Any]:
-        summary_path = self.reports_root / batch_id / "summary.json"
-        if not summary_path.exists():
-            raise FileNotFoundError(f"batch not found: {batch_id}")
+        if self.index is not None:
+            # Only summaries whose mtime/size changed since the last listing are parsed.
+            self.index.sync("batch", "", batch_dirs, self._indexed_batch_row)
+            total, items = self.index.query("batch", "", limit=limit, offset=offset, tag=needle)
+            return {"total": total, "limit": limit, "offset": offset, "items": items}
 
-        summary = self._load_json(summary_path)
-        scenarios_raw = summary.get("scenarios", []) if isinstance(summary.get("scenarios"), list) else []
-        scenarios: List[Dict[str, Any]] = []
+        if needle is not None:
+            batch_dirs = [entry for entry in batch_dirs if self._summary_strategy(*entry) == needle]
 
-        for scenario in scenarios_raw:
-            if not isinstance(scenario, dict):
-                continue
+        # Scenario totals are only aggregated for the batches on the requested page.
+        page = [
+            self._batch_row(batch_id, mtime_ns, size)._asdict()
+            for batch_id, mtime_ns, size in batch_dirs[offset : offset + limit]
+        ]
+        return {"total": len(batch_dirs), "limit": limit, "offset": offset, "items": page}
 
+    def get_batch(self, batch_id: str) -> Dict[str, Any]:
+        summary_path = self.reports_root / batch_id / "summary.json"
+        try:
+            st = summary_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"batch not found: {batch_id}") from None
+
+        # Shared with list_batches through the mtime-keyed cache; only read from it here.
+        summary = self._load_summary(summary_path, st.st_mtime_ns, st.st_size)
+        resolved: List[Tuple[Dict[str, Any], Optional[str], Optional[Path]]] = []
+        for scenario in _coerce_summary(summary)["scenarios"]:
             best = scenario.get("best") if isinstance(scenario.get("best"), dict) else None
             best_report_path = str(best.get("report")) if best else ""
             run_id = self._run_id_from_report_path(best_report_path) if best_report_path else None
+            run_path = self._resolve_report_path(best_report_path) if best_report_path else None
+            resolved.append((scenario, run_id, run_path))
 
+        run_paths = list(dict.fromkeys(run_path for _, _, run_path in resolved if run_path is not None))
+        trade_logs: Dict[Path, Any] = {}
+        if run_paths:
+            with ThreadPoolExecutor(max_workers=min(_MAX_LOAD_WORKERS, len(run_paths))) as executor:
+                trade_logs = dict(zip(run_paths, executor.map(self._load_trade_log, run_paths)))
+
+        scenarios: List[Dict[str, Any]] = []
+        for scenario, run_id, run_path in resolved:
             equity_curve: List[Dict[str, float]] = []
             trades_count: Optional[int] = None
-            if best_report_path:
-                run_path = self._resolve_report_path(best_report_path)
-                if run_path and run_path.exists():
-                    run_payload = self._load_json(run_path)
-                    trade_log = run_payload.get("backtest", {}).get("trade_log", [])
-                    equity_curve = self._equity_curve_from_trade_log(trade_log=trade_log)
-                    if isinstance(trade_log, list):
-                        trades_count = len(trade_log)
+            if run_path is not None:
+                trade_log = trade_logs[run_path]
+                equity_curve = self._equity_curve_from_trade_log(trade_log=trade_log)
+                if isinstance(trade_log, list):
+                    trades_count = len(trade_log)
 
             scenario_enriched = dict(scenario)
             scenario_enriched["best_run_id"] = run_id
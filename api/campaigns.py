@@ -1,30 +1,155 @@
 from __future__ import annotations
 
-import json
+import hashlib
 import math
+import os
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from datetime import datetime, timezone
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
+from api.fs_scan import FileStat, child_file_stats, dir_file_stats
+from api.json_io import dumps, loads, read_json, write_bytes_atomic, write_json
+from api.listing_index import ListingIndex, RowBuilder
 from cbot_farm.exporters import export_campaign_payload, write_export_manifest
 
-ALLOWED_STATES = {
-    "queued",
-    "brief_generated",
-    "code_generated",
-    "campaign_running",
-    "campaign_evaluated",
-    "refinement_planned",
-    "completed",
-    "failed",
-    "paused",
-    "cancelled",
-}
+_UTC = timezone.utc
+_tick = threading.local()
+
+# Score weights for the return, drawdown, sharpe and OOS components, in that order.
+_SCORE_WEIGHTS = (0.35, 0.30, 0.20, 0.15)
+_RETURN_OFFSET = 20.0
+_RETURN_SCALE = 40.0
+_SCORE_EPS = 1e-6
+
+_MAX_LOAD_WORKERS = 8
+# Events kept inline in campaign.json; older ones move to history.jsonl.
+_HISTORY_LIMIT = 500
+_ENCODED_CACHE_LIMIT = 512
+# Campaign/iteration files whose raw bytes stay cached; least recently used go first.
+_JSON_CACHE_LIMIT = 512
+# Campaign subfolders reported by list_artifacts, in response order.
+_ARTIFACT_FOLDERS = ("iterations", "artifacts", "patches", "exports")
+
+ALLOWED_STATES = frozenset(
+    {
+        "queued",
+        "brief_generated",
+        "code_generated",
+        "campaign_running",
+        "campaign_evaluated",
+        "refinement_planned",
+        "completed",
+        "failed",
+        "paused",
+        "cancelled",
+    }
+)
+EXPORT_TARGETS = frozenset({"ctrader", "pine"})
+
+
+class CampaignRow(NamedTuple):
+    campaign_id: Any
+    name: Any
+    status: Any
+    created_at: Any
+    updated_at: Any
+    prompt: Any
+    iterations_total: Any
+    best_score: Any
+
+
+class IterationRow(NamedTuple):
+    iteration_id: str
+    status: Any
+    score: Any
+    decision: Any
+    created_at: Any
+    summary: Any
+
+
+def _campaign_row(payload: Dict[str, Any]) -> CampaignRow:
+    stats = payload.get("stats") or {}
+    return CampaignRow(
+        campaign_id=payload.get("campaign_id"),
+        name=payload.get("name"),
+        status=payload.get("status"),
+        created_at=payload.get("created_at"),
+        updated_at=payload.get("updated_at"),
+        prompt=payload.get("prompt", ""),
+        iterations_total=stats.get("iterations_total", 0),
+        best_score=stats.get("best_score"),
+    )
+
+
+def _iteration_row(iteration_id: str, payload: Dict[str, Any]) -> IterationRow:
+    return IterationRow(
+        iteration_id=iteration_id,
+        status=payload.get("status", "unknown"),
+        score=payload.get("score"),
+        decision=payload.get("decision"),
+        created_at=payload.get("created_at"),
+        summary=payload.get("summary", ""),
+    )
+
+
+def _iterations_total(campaign: Dict[str, Any]) -> int:
+    return int((campaign.get("stats") or {}).get("iterations_total", 0) or 0)
+
+
+@lru_cache(maxsize=4096)
+def _iso_second(seconds: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+
+
+def _iso_utc(seconds: int, micros: int) -> str:
+    # Same text as datetime.isoformat() for a UTC datetime, including dropping a zero fraction.
+    if micros:
+        return f"{_iso_second(seconds)}.{micros:06d}+00:00"
+    return f"{_iso_second(seconds)}+00:00"
+
+
+def _iso_utc_from_timestamp(timestamp: float) -> str:
+    # Rounds half-even to the microsecond like datetime.fromtimestamp.
+    seconds = math.floor(timestamp)
+    micros = round((timestamp - seconds) * 1e6)
+    if micros >= 1_000_000:
+        seconds += 1
+        micros -= 1_000_000
+    return _iso_utc(seconds, micros)
+
+
+def _format_utc_now() -> str:
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    return _iso_utc(seconds, nanos // 1000)
 
 
 def _utc_now() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    now = getattr(_tick, "now", None)
+    if now is not None:
+        return now
+    return _format_utc_now()
+
+
+@contextmanager
+def _utc_tick() -> Iterator[str]:
+    # One logical operation gets one timestamp; nested ticks reuse the outermost one.
+    now = getattr(_tick, "now", None)
+    if now is not None:
+        yield now
+        return
+    _tick.now = _format_utc_now()
+    try:
+        yield _tick.now
+    finally:
+        _tick.now = None
 
 
 def _safe_float(value: Any, default: float = 0.0) -> float:
@@ -38,14 +163,50 @@ def _safe_float(value: Any, default: float = 0.0) -> float:
     return default
 
 
-def _clamp(v: float, lo: float, hi: float) -> float:
-    return max(lo, min(hi, v))
+@lru_cache(maxsize=1024)
+def _load_json_cached(path_str: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    # Shared between callers: list views only read from the returned payload.
+    return read_json(Path(path_str))
+
+
+def _load_json_many(entries: List[FileStat]) -> List[Dict[str, Any]]:
+    # Entries are (path, mtime_ns, size). File reads release the GIL and orjson parses in C, so
+    # cold listings overlap their loads on a bounded pool; order follows the input.
+    if len(entries) < 2:
+        return [_load_json_cached(*entry) for entry in entries]
+    with ThreadPoolExecutor(max_workers=min(_MAX_LOAD_WORKERS, len(entries))) as executor:
+        return list(executor.map(lambda entry: _load_json_cached(*entry), entries))
+
+
+def _walk_files(root: str, prefix: str) -> List[Tuple[Tuple[str, ...], os.stat_result]]:
+    # Iterative scandir walk; each file is stat'ed once and keyed by its relative path components.
+    files: List[Tuple[Tuple[str, ...], os.stat_result]] = []
+    stack = [(root, (prefix,))]
+    while stack:
+        path, parts = stack.pop()
+        try:
+            it = os.scandir(path)
+        except FileNotFoundError:
+            continue
+        with it:
+            for entry in it:
+                entry_parts = parts + (entry.name,)
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, entry_parts))
+                elif entry.is_file():
+                    files.append((entry_parts, entry.stat()))
+    return files
 
 
 class CampaignStore:
-    def __init__(self, campaigns_root: Path) -> None:
+    def __init__(self, campaigns_root: Path, index: Optional[ListingIndex] = None) -> None:
         self.campaigns_root = campaigns_root
+        self.index = index
         self.campaigns_root.mkdir(parents=True, exist_ok=True)
+        # Campaign file stats as of the last index sync; listings re-sync only when they change.
+        self._synced_campaign_files: Optional[List[FileStat]] = None
+        self._json_cache: OrderedDict[Path, Tuple[int, int, bytes]] = OrderedDict()
+        self._encoded_cache: Dict[str, Tuple[int, int, bytes, str]] = {}
 
     def campaign_dir(self, campaign_id: str) -> Path:
         return self.campaigns_root / campaign_id
@@ -68,14 +229,56 @@ class CampaignStore:
     def iteration_file(self, campaign_id: str, iteration_id: str) -> Path:
         return self.iterations_dir(campaign_id) / f"{iteration_id}.json"
 
-    def _load_json(self, path: Path) -> Dict[str, Any]:
-        with path.open("r", encoding="utf-8") as fh:
-            return json.load(fh)
+    def history_file(self, campaign_id: str) -> Path:
+        return self.campaign_dir(campaign_id) / "history.jsonl"
 
-    def _save_json(self, path: Path, payload: Dict[str, Any]) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("w", encoding="utf-8") as fh:
-            json.dump(payload, fh, indent=2)
+    def _load_json(self, path: Path) -> Dict[str, Any]:
+        st = path.stat()
+        cached = self._json_cache.get(path)
+        if cached is None or cached[0] != st.st_mtime_ns or cached[1] != st.st_size:
+            cached = (st.st_mtime_ns, st.st_size, path.read_bytes())
+            self._cache_bytes(path, cached)
+        else:
+            # Request threads share the store; another one may have evicted the entry meanwhile.
+            with suppress(KeyError):
+                self._json_cache.move_to_end(path)
+        # Raw bytes, parsed per call: callers mutate what they load, and a fresh parse is cheaper
+        # than deep-copying a shared payload.
+        return loads(cached[2])
+
+    def _remember(self, path: Path, data: bytes) -> os.stat_result:
+        st = path.stat()
+        self._cache_bytes(path, (st.st_mtime_ns, st.st_size, data))
+        return st
+
+    def _cache_bytes(self, path: Path, entry: Tuple[int, int, bytes]) -> None:
+        # Re-inserting puts the entry at the recent end even if the path was already cached.
+        self._json_cache.pop(path, None)
+        self._json_cache[path] = entry
+        if len(self._json_cache) > _JSON_CACHE_LIMIT:
+            self._json_cache.popitem(last=False)
+
+    def _campaign_files(self) -> List[FileStat]:
+        return child_file_stats(self.campaigns_root, "campaign.json")
+
+    def _save_json(self, path: Path, payload: Dict[str, Any]) -> os.stat_result:
+        data = dumps(payload)
+        try:
+            unchanged = path.stat().st_size == len(data) and path.read_bytes() == data
+        except FileNotFoundError:
+            unchanged = False
+        if not unchanged:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_bytes_atomic(path, data)
+        return self._remember(path, data)
+
+    def _save_json_batched(self, items: List[Tuple[Path, Dict[str, Any]]]) -> List[bytes]:
+        # Encode everything up front so a serialization error cannot leave a partial batch on disk.
+        encoded = [(path, dumps(payload)) for path, payload in items]
+        for path, data in encoded:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_bytes_atomic(path, data)
+        return [data for _path, data in encoded]
 
     def create_campaign(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         campaign_id = payload.get("campaign_id") or f"cmp_{uuid.uuid4().hex[:12]}"
@@ -120,115 +323,227 @@ class CampaignStore:
         self.artifacts_dir(campaign_id).mkdir(parents=True, exist_ok=True)
         self.patches_dir(campaign_id).mkdir(parents=True, exist_ok=True)
         self.exports_dir(campaign_id).mkdir(parents=True, exist_ok=True)
-        self._save_json(self.campaign_file(campaign_id), campaign)
+        st = self._save_json(self.campaign_file(campaign_id), campaign)
+        self._index_campaign(campaign_id, campaign, st)
         return campaign
 
     def list_campaigns(self, limit: int = 50, offset: int = 0, status: Optional[str] = None) -> Dict[str, Any]:
-        files = sorted(
-            [p for p in self.campaigns_root.glob("*/campaign.json") if p.is_file()],
-            key=lambda p: p.stat().st_mtime,
-            reverse=True,
-        )
+        if self.index is not None:
+            # One scandir pass tells whether anything was added, removed or edited outside this
+            # store since the last sync; an unchanged directory lists with a single query.
+            files = self._campaign_files()
+            if files != self._synced_campaign_files:
+                self.index.sync("campaign", "", files, self._indexed_campaign_row)
+                self._synced_campaign_files = files
+            tag = status.lower() if status else None
+            total, items = self.index.query("campaign", "", limit=limit, offset=offset, tag=tag)
+            return {"total": total, "limit": limit, "offset": offset, "items": items}
+
+        files = self._campaign_files()
+        if not status:
+            # Without a filter the stat-sorted file list already fixes the page; parse only that slice.
+            payloads = _load_json_many(self._campaign_sources(files[offset : offset + limit]))
+            page = [_campaign_row(payload)._asdict() for payload in payloads]
+            return {"total": len(files), "limit": limit, "offset": offset, "items": page}
+
+        needle = status.lower()
+        rows: List[CampaignRow] = []
+        for payload in _load_json_many(self._campaign_sources(files)):
+            if str(payload.get("status", "")).lower() != needle:
+                continue
+            rows.append(_campaign_row(payload))
+
+        page = [row._asdict() for row in rows[offset : offset + limit]]
+        return {"total": len(rows), "limit": limit, "offset": offset, "items": page}
 
-        items: List[Dict[str, Any]] = []
-        for path in files:
-            payload = self._load_json(path)
-            if status and str(payload.get("status", "")).lower() != status.lower():
+    def iter_campaign_summaries(self, status: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        # Newest first, one summary row at a time; nothing beyond the stat list is held in memory.
+        needle = status.lower() if status else None
+        for source in self._campaign_sources(self._campaign_files()):
+            payload = _load_json_cached(*source)
+            if needle is not None and str(payload.get("status", "")).lower() != needle:
                 continue
-            items.append(
-                {
-                    "campaign_id": payload.get("campaign_id"),
-                    "name": payload.get("name"),
-                    "status": payload.get("status"),
-                    "created_at": payload.get("created_at"),
-                    "updated_at": payload.get("updated_at"),
-                    "prompt": payload.get("prompt", ""),
-                    "iterations_total": payload.get("stats", {}).get("iterations_total", 0),
-                    "best_score": payload.get("stats", {}).get("best_score"),
-                }
-            )
+            yield _campaign_row(payload)._asdict()
+
+    def _campaign_sources(self, files: List[FileStat]) -> List[FileStat]:
+        return [(str(self.campaign_file(campaign_id)), mtime_ns, size) for campaign_id, mtime_ns, size in files]
 
-        total = len(items)
-        page = items[offset : offset + limit]
-        return {"total": total, "limit": limit, "offset": offset, "items": page}
+    def _indexed_campaign_row(self, campaign_id: str, mtime_ns: int, size: int) -> Tuple[Optional[str], Dict[str, Any]]:
+        payload = _load_json_cached(str(self.campaign_file(campaign_id)), mtime_ns, size)
+        return str(payload.get("status", "")).lower(), _campaign_row(payload)._asdict()
+
+    def _index_campaign(self, campaign_id: str, campaign: Dict[str, Any], st: os.stat_result) -> None:
+        if self.index is None:
+            return
+        tag = str(campaign.get("status", "")).lower()
+        row = _campaign_row(campaign)._asdict()
+        self.index.upsert("campaign", "", campaign_id, st.st_mtime_ns, st.st_size, tag, row)
+
+    def _index_iteration(
+        self,
+        campaign_id: str,
+        iteration_id: str,
+        payload: Dict[str, Any],
+        st: os.stat_result,
+    ) -> None:
+        if self.index is None:
+            return
+        row = _iteration_row(iteration_id, payload)._asdict()
+        self.index.upsert("iteration", campaign_id, iteration_id, st.st_mtime_ns, st.st_size, None, row)
 
     def get_campaign(self, campaign_id: str) -> Dict[str, Any]:
+        try:
+            return self._load_json(self.campaign_file(campaign_id))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"campaign not found: {campaign_id}") from None
+
+    def _spill_history(self, campaign_id: str, campaign: Dict[str, Any]) -> None:
+        # Keeps each campaign.json rewrite bounded. The overflow is appended before the campaign
+        # file is replaced, so a failed save can duplicate archived events but never lose them.
+        history = campaign.get("history")
+        if not isinstance(history, list) or len(history) <= _HISTORY_LIMIT:
+            return
+        overflow = history[:-_HISTORY_LIMIT]
+        with self.history_file(campaign_id).open("ab") as fh:
+            fh.write(b"".join(dumps(event, indent=False, newline=True) for event in overflow))
+        del history[:-_HISTORY_LIMIT]
+
+    def load_history(self, campaign_id: str) -> List[Dict[str, Any]]:
+        history = self.get_campaign(campaign_id).get("history")
+        try:
+            with self.history_file(campaign_id).open("rb") as fh:
+                archived = [loads(line) for line in fh if line.strip()]
+        except FileNotFoundError:
+            archived = []
+        return archived + (history if isinstance(history, list) else [])
+
+    def get_campaign_encoded(self, campaign_id: str) -> Tuple[bytes, str]:
+        # Compact JSON plus an ETag for the campaign as stored; repeat reads of an unchanged
+        # file cost one stat and skip both the parse and the encode.
         path = self.campaign_file(campaign_id)
-        if not path.exists():
-            raise FileNotFoundError(f"campaign not found: {campaign_id}")
-        return self._load_json(path)
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"campaign not found: {campaign_id}") from None
+        cached = self._encoded_cache.get(campaign_id)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2], cached[3]
+
+        body = dumps(self.get_campaign(campaign_id), indent=False)
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        if len(self._encoded_cache) >= _ENCODED_CACHE_LIMIT:
+            self._encoded_cache.pop(next(iter(self._encoded_cache), None), None)
+        self._encoded_cache[campaign_id] = (st.st_mtime_ns, st.st_size, body, etag)
+        return body, etag
 
     def save_campaign(self, campaign: Dict[str, Any]) -> Dict[str, Any]:
         campaign_id = str(campaign["campaign_id"])
         campaign["updated_at"] = _utc_now()
-        self._save_json(self.campaign_file(campaign_id), campaign)
+        self._spill_history(campaign_id, campaign)
+        st = self._save_json(self.campaign_file(campaign_id), campaign)
+        self._index_campaign(campaign_id, campaign, st)
+        return campaign
+
+    def save_evaluation(
+        self,
+        campaign: Dict[str, Any],
+        iteration_id: str,
+        iteration: Dict[str, Any],
+        artifact: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        campaign_id = str(campaign["campaign_id"])
+        campaign["updated_at"] = _utc_now()
+        self._spill_history(campaign_id, campaign)
+        iteration_path = self.iteration_file(campaign_id, iteration_id)
+        campaign_path = self.campaign_file(campaign_id)
+        # campaign.json goes last: it is what readers use to discover the new state.
+        iteration_data, _artifact_data, campaign_data = self._save_json_batched(
+            [
+                (iteration_path, iteration),
+                (self.artifacts_dir(campaign_id) / f"evaluation_{iteration_id}.json", artifact),
+                (campaign_path, campaign),
+            ]
+        )
+        self._index_iteration(campaign_id, iteration_id, iteration, self._remember(iteration_path, iteration_data))
+        self._index_campaign(campaign_id, campaign, self._remember(campaign_path, campaign_data))
         return campaign
 
     def get_iteration(self, campaign_id: str, iteration_id: str) -> Dict[str, Any]:
-        path = self.iteration_file(campaign_id, iteration_id)
-        if not path.exists():
-            raise FileNotFoundError(f"iteration not found: {iteration_id}")
-        return self._load_json(path)
+        try:
+            return self._load_json(self.iteration_file(campaign_id, iteration_id))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"iteration not found: {iteration_id}") from None
 
     def save_iteration(self, campaign_id: str, iteration_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        self._save_json(self.iteration_file(campaign_id, iteration_id), payload)
+        st = self._save_json(self.iteration_file(campaign_id, iteration_id), payload)
+        self._index_iteration(campaign_id, iteration_id, payload, st)
         return payload
 
+    def _iteration_files(self, campaign_id: str) -> List[FileStat]:
+        try:
+            files = dir_file_stats(self.iterations_dir(campaign_id), "iter_", ".json")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"campaign not found: {campaign_id}") from None
+        # Key iterations by id rather than file name.
+        return [(name[:-5], mtime_ns, size) for name, mtime_ns, size in files]
+
     def list_iterations(self, campaign_id: str, limit: int = 100, offset: int = 0) -> Dict[str, Any]:
-        base = self.iterations_dir(campaign_id)
-        if not base.exists():
-            raise FileNotFoundError(f"campaign not found: {campaign_id}")
-
-        files = sorted(
-            [p for p in base.glob("iter_*.json") if p.is_file()],
-            key=lambda p: p.stat().st_mtime,
-            reverse=True,
+        files = self._iteration_files(campaign_id)
+
+        if self.index is not None:
+            self.index.sync("iteration", campaign_id, files, self._indexed_iteration_row(campaign_id))
+            total, items = self.index.query("iteration", campaign_id, limit=limit, offset=offset)
+            return {"total": total, "limit": limit, "offset": offset, "items": items}
+
+        selected = files[offset : offset + limit]
+        payloads = _load_json_many(
+            [
+                (str(self.iteration_file(campaign_id, iteration_id)), mtime_ns, size)
+                for iteration_id, mtime_ns, size in selected
+            ]
         )
+        page = [
+            _iteration_row(iteration_id, payload)._asdict()
+            for (iteration_id, _, _), payload in zip(selected, payloads)
+        ]
+        return {"total": len(files), "limit": limit, "offset": offset, "items": page}
 
-        items: List[Dict[str, Any]] = []
-        for path in files:
-            payload = self._load_json(path)
-            items.append(
-                {
-                    "iteration_id": path.stem,
-                    "status": payload.get("status", "unknown"),
-                    "score": payload.get("score"),
-                    "decision": payload.get("decision"),
-                    "created_at": payload.get("created_at"),
-                    "summary": payload.get("summary", ""),
-                }
-            )
+    def _indexed_iteration_row(self, campaign_id: str) -> RowBuilder:
+        def build(iteration_id: str, mtime_ns: int, size: int) -> Tuple[Optional[str], Dict[str, Any]]:
+            payload = _load_json_cached(str(self.iteration_file(campaign_id, iteration_id)), mtime_ns, size)
+            return None, _iteration_row(iteration_id, payload)._asdict()
 
-        total = len(items)
-        page = items[offset : offset + limit]
-        return {"total": total, "limit": limit, "offset": offset, "items": page}
+        return build
 
     def list_artifacts(self, campaign_id: str) -> Dict[str, Any]:
-        base = self.campaign_dir(campaign_id)
-        if not base.exists():
-            raise FileNotFoundError(f"campaign not found: {campaign_id}")
-
-        folders = {
-            "iterations": self.iterations_dir(campaign_id),
-            "artifacts": self.artifacts_dir(campaign_id),
-            "patches": self.patches_dir(campaign_id),
-            "exports": self.exports_dir(campaign_id),
-        }
+        # One listing of the campaign folder both checks it exists and finds the subfolders to walk.
+        try:
+            with os.scandir(self.campaign_dir(campaign_id)) as it:
+                present = {
+                    entry.name: entry.path
+                    for entry in it
+                    if entry.name in _ARTIFACT_FOLDERS and entry.is_dir()
+                }
+        except FileNotFoundError:
+            raise FileNotFoundError(f"campaign not found: {campaign_id}") from None
 
         out: Dict[str, Any] = {"campaign_id": campaign_id}
-        for name, folder in folders.items():
-            files: List[Dict[str, Any]] = []
-            if folder.exists():
-                for p in sorted(folder.rglob("*")):
-                    if p.is_file():
-                        files.append(
-                            {
-                                "path": str(p.relative_to(base)),
-                                "bytes": p.stat().st_size,
-                                "modified_at": datetime.fromtimestamp(p.stat().st_mtime, tz=timezone.utc).isoformat(),
-                            }
-                        )
-            out[name] = files
+        for name in _ARTIFACT_FOLDERS:
+            folder = present.get(name)
+            if folder is None:
+                out[name] = []
+                continue
+            entries = _walk_files(folder, name)
+            # Same order as sorted(Path.rglob(...)): compare path components, not raw strings.
+            entries.sort(key=itemgetter(0))
+            out[name] = [
+                {
+                    "path": os.sep.join(parts),
+                    "bytes": st.st_size,
+                    "modified_at": _iso_utc_from_timestamp(st.st_mtime),
+                }
+                for parts, st in entries
+            ]
 
         return out
 
@@ -237,12 +552,19 @@ class CampaignOrchestrator:
     def __init__(self, store: CampaignStore) -> None:
         self.store = store
 
-    def _transition(self, campaign: Dict[str, Any], to_state: str, reason: str) -> Dict[str, Any]:
+    def _transition(
+        self,
+        campaign: Dict[str, Any],
+        to_state: str,
+        reason: str,
+        persist: bool = True,
+    ) -> Dict[str, Any]:
         if to_state not in ALLOWED_STATES:
             raise ValueError(f"invalid state: {to_state}")
 
         from_state = campaign.get("status")
         if from_state == to_state:
+            # A repeated request for the current state is a no-op: no event, no timestamp, no write.
             return campaign
 
         event = {
@@ -254,6 +576,8 @@ class CampaignOrchestrator:
         }
         campaign["status"] = to_state
         campaign.setdefault("history", []).append(event)
+        if not persist:
+            return campaign
         return self.store.save_campaign(campaign)
 
     def _record_event(self, campaign: Dict[str, Any], event_name: str, reason: str) -> Dict[str, Any]:
@@ -268,6 +592,7 @@ class CampaignOrchestrator:
         )
         return self.store.save_campaign(campaign)
 
+    @_utc_tick()
     def create(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         campaign = self.store.create_campaign(payload)
         return self._transition(campaign, "brief_generated", "orchestrator initialized")
@@ -278,16 +603,17 @@ class CampaignOrchestrator:
 
     def resume(self, campaign_id: str, reason: str) -> Dict[str, Any]:
         campaign = self.store.get_campaign(campaign_id)
-        next_state = "campaign_running" if campaign.get("stats", {}).get("iterations_total", 0) > 0 else "brief_generated"
+        next_state = "campaign_running" if _iterations_total(campaign) > 0 else "brief_generated"
         return self._transition(campaign, next_state, reason or "resumed by user")
 
     def cancel(self, campaign_id: str, reason: str) -> Dict[str, Any]:
         campaign = self.store.get_campaign(campaign_id)
         return self._transition(campaign, "cancelled", reason or "cancelled by user")
 
+    @_utc_tick()
     def register_iteration_stub(self, campaign_id: str, summary: str = "") -> Dict[str, Any]:
         campaign = self.store.get_campaign(campaign_id)
-        total = int(campaign.get("stats", {}).get("iterations_total", 0)) + 1
+        total = _iterations_total(campaign) + 1
         iteration_id = f"iter_{total:04d}"
         payload = {
             "iteration": total,
@@ -300,36 +626,41 @@ class CampaignOrchestrator:
 
         self.store.save_iteration(campaign_id, iteration_id, payload)
         campaign.setdefault("stats", {})["iterations_total"] = total
+        self._transition(campaign, "campaign_running", "iteration stub created", persist=False)
         self.store.save_campaign(campaign)
-        self._transition(campaign, "campaign_running", "iteration stub created")
 
         return payload
 
-    def _evaluate_metrics(self, metrics: Dict[str, Any], gates: Dict[str, Any]) -> Dict[str, Any]:
+    def _parse_gates(self, gates: Dict[str, Any]) -> Tuple[float, float, float]:
+        return (
+            _safe_float(gates.get("max_drawdown_pct"), 12.0),
+            _safe_float(gates.get("min_sharpe"), 1.2),
+            _safe_float(gates.get("max_oos_degradation_pct"), 30.0),
+        )
+
+    def _evaluate_with_gates(
+        self,
+        metrics: Dict[str, Any],
+        gate_dd: float,
+        gate_sharpe: float,
+        gate_oos: float,
+    ) -> Dict[str, Any]:
         total_return = _safe_float(metrics.get("total_return_pct"), 0.0)
         sharpe = _safe_float(metrics.get("sharpe"), 0.0)
         max_dd = _safe_float(metrics.get("max_drawdown_pct"), 100.0)
         oos_deg = _safe_float(metrics.get("oos_degradation_pct"), 100.0)
 
-        gate_dd = _safe_float(gates.get("max_drawdown_pct"), 12.0)
-        gate_sharpe = _safe_float(gates.get("min_sharpe"), 1.2)
-        gate_oos = _safe_float(gates.get("max_oos_degradation_pct"), 30.0)
-
         pass_drawdown = max_dd <= gate_dd
         pass_sharpe = sharpe >= gate_sharpe
         pass_oos = oos_deg <= gate_oos
 
-        ret_component = _clamp(((total_return + 20.0) / 40.0) * 100.0, 0.0, 100.0)
-        dd_component = _clamp((gate_dd / max(max_dd, 1e-6)) * 100.0, 0.0, 100.0)
-        sharpe_component = _clamp((sharpe / max(gate_sharpe, 1e-6)) * 100.0, 0.0, 100.0)
-        oos_component = _clamp((gate_oos / max(oos_deg, 1e-6)) * 100.0, 0.0, 100.0)
+        ret_component = min(100.0, max(0.0, ((total_return + _RETURN_OFFSET) / _RETURN_SCALE) * 100.0))
+        dd_component = min(100.0, max(0.0, (gate_dd / max(max_dd, _SCORE_EPS)) * 100.0))
+        sharpe_component = min(100.0, max(0.0, (sharpe / max(gate_sharpe, _SCORE_EPS)) * 100.0))
+        oos_component = min(100.0, max(0.0, (gate_oos / max(oos_deg, _SCORE_EPS)) * 100.0))
 
-        score = (
-            ret_component * 0.35
-            + dd_component * 0.30
-            + sharpe_component * 0.20
-            + oos_component * 0.15
-        )
+        w_ret, w_dd, w_sharpe, w_oos = _SCORE_WEIGHTS
+        score = ret_component * w_ret + dd_component * w_dd + sharpe_component * w_sharpe + oos_component * w_oos
 
         return {
             "metrics": {
@@ -358,6 +689,20 @@ class CampaignOrchestrator:
             "score": round(score, 4),
         }
 
+    def _evaluate_metrics(self, metrics: Dict[str, Any], gates: Dict[str, Any]) -> Dict[str, Any]:
+        return self._evaluate_with_gates(metrics, *self._parse_gates(gates))
+
+    def _evaluate_metrics_batch(
+        self,
+        metrics_list: List[Dict[str, Any]],
+        gates: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        # Sweeps share one gate set, so gates are parsed once for the whole batch.
+        gate_dd, gate_sharpe, gate_oos = self._parse_gates(gates)
+        evaluate = self._evaluate_with_gates
+        return [evaluate(metrics, gate_dd, gate_sharpe, gate_oos) for metrics in metrics_list]
+
+    @_utc_tick()
     def evaluate_iteration(
         self,
         campaign_id: str,
@@ -373,20 +718,21 @@ class CampaignOrchestrator:
 
         stats = campaign.setdefault("stats", {})
         best_score = stats.get("best_score")
-        improved = best_score is None or score > float(best_score)
-        if improved:
+        streak = int(stats.get("no_improve_streak", 0) or 0)
+        loops = int(stats.get("iterations_total", 0) or 0)
+
+        if best_score is None or score > float(best_score):
             stats["best_score"] = score
             stats["best_iteration"] = iteration_id
-            stats["no_improve_streak"] = 0
+            streak = 0
         else:
-            stats["no_improve_streak"] = int(stats.get("no_improve_streak", 0)) + 1
-
+            streak += 1
+        stats["no_improve_streak"] = streak
         stats["last_score"] = score
 
-        budgets = campaign.get("budgets", {})
+        budgets = campaign.get("budgets") or {}
         max_loops = int(budgets.get("max_loops", 50))
         max_no_improve = int(budgets.get("max_no_improve_loops", 5))
-        loops = int(stats.get("iterations_total", 0))
 
         if evaluation["pass"]["all"]:
             decision = "promote_candidate"
@@ -396,7 +742,7 @@ class CampaignOrchestrator:
         stop_reasons: List[str] = []
         if loops >= max_loops:
             stop_reasons.append("max_loops_reached")
-        if int(stats.get("no_improve_streak", 0)) >= max_no_improve:
+        if streak >= max_no_improve:
             stop_reasons.append("no_improvement_limit_reached")
 
         if decision == "iterate" and stop_reasons:
@@ -410,17 +756,20 @@ class CampaignOrchestrator:
         iteration["decision"] = decision
         iteration["notes"] = notes
         iteration["stop_reasons"] = stop_reasons
-        self.store.save_iteration(campaign_id, iteration_id, iteration)
-        self.store.save_campaign(campaign)
 
-        self._transition(campaign, "campaign_evaluated", f"iteration {iteration_id} evaluated")
+        self._transition(campaign, "campaign_evaluated", f"iteration {iteration_id} evaluated", persist=False)
 
         if decision == "promote_candidate":
-            self._transition(campaign, "completed", f"iteration {iteration_id} passed all gates")
+            self._transition(campaign, "completed", f"iteration {iteration_id} passed all gates", persist=False)
         elif decision == "reject_stop":
-            self._transition(campaign, "failed", f"iteration {iteration_id} reached stop criteria")
+            self._transition(campaign, "failed", f"iteration {iteration_id} reached stop criteria", persist=False)
         else:
-            self._transition(campaign, "refinement_planned", f"iteration {iteration_id} requires refinement")
+            self._transition(
+                campaign,
+                "refinement_planned",
+                f"iteration {iteration_id} requires refinement",
+                persist=False,
+            )
 
         artifact = {
             "campaign_id": campaign_id,
@@ -430,9 +779,8 @@ class CampaignOrchestrator:
             "decision": decision,
             "stop_reasons": stop_reasons,
         }
-        ev_path = self.store.artifacts_dir(campaign_id) / f"evaluation_{iteration_id}.json"
-        with ev_path.open("w", encoding="utf-8") as fh:
-            json.dump(artifact, fh, indent=2)
+        # Iteration, evaluation artifact and campaign are flushed together in one batch.
+        self.store.save_evaluation(campaign, iteration_id, iteration, artifact)
 
         return {
             "campaign_id": campaign_id,
@@ -443,6 +791,7 @@ class CampaignOrchestrator:
             "stop_reasons": stop_reasons,
         }
 
+    @_utc_tick()
     def critic_proposal(self, campaign_id: str, iteration_id: str) -> Dict[str, Any]:
         campaign = self.store.get_campaign(campaign_id)
         iteration = self.store.get_iteration(campaign_id, iteration_id)
@@ -467,7 +816,7 @@ class CampaignOrchestrator:
             suggestions.append("Promote this candidate to manual review and run parity/export checks.")
 
         proposal = {
-            "proposal_id": f"critic_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}",
+            "proposal_id": f"critic_{datetime.now(_UTC).strftime('%Y%m%d_%H%M%S')}",
             "campaign_id": campaign_id,
             "iteration_id": iteration_id,
             "created_at": _utc_now(),
@@ -477,8 +826,7 @@ class CampaignOrchestrator:
         }
 
         out_file = self.store.artifacts_dir(campaign_id) / f"critic_{iteration_id}.json"
-        with out_file.open("w", encoding="utf-8") as fh:
-            json.dump(proposal, fh, indent=2)
+        write_json(out_file, proposal)
 
         iteration["critic"] = proposal
         self.store.save_iteration(campaign_id, iteration_id, iteration)
@@ -488,6 +836,7 @@ class CampaignOrchestrator:
 
         return proposal
 
+    @_utc_tick()
     def loop_tick(
         self,
         campaign_id: str,
@@ -513,13 +862,14 @@ class CampaignOrchestrator:
             "critic": critic,
         }
 
+    @_utc_tick()
     def request_export(self, campaign_id: str, target: str) -> Dict[str, Any]:
         normalized = target.lower().strip()
-        if normalized not in {"ctrader", "pine"}:
+        if normalized not in EXPORT_TARGETS:
             raise ValueError("unsupported export target")
 
         campaign = self.store.get_campaign(campaign_id)
-        stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        stamp = datetime.now(_UTC).strftime("%Y%m%d_%H%M%S")
         export_payload = export_campaign_payload(
             campaign=campaign,
             target=normalized,
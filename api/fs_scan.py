@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import heapq
+import os
+import stat
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+# (entry name, mtime_ns, size), newest first. Names only: callers build full paths for the rows they keep.
+FileStat = Tuple[str, int, int]
+
+
+def child_file_stats(root: Path, filename: str, prefix: str = "") -> List[FileStat]:
+    # Stats root/<dir>/<filename> for every subdirectory whose name starts with prefix.
+    files: List[FileStat] = []
+    with os.scandir(root) as it:
+        for entry in it:
+            if not entry.name.startswith(prefix) or not entry.is_dir():
+                continue
+            try:
+                st = os.stat(os.path.join(entry.path, filename))
+            except FileNotFoundError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                files.append((entry.name, st.st_mtime_ns, st.st_size))
+    files.sort(key=itemgetter(1), reverse=True)
+    return files
+
+
+def dir_file_stats(root: Path, prefix: str, suffix: str, ordered: bool = True) -> List[FileStat]:
+    # Stats every regular file directly under root named <prefix>...<suffix>; ordered=False skips
+    # the sort for callers that consume the list through iter_newest.
+    files: List[FileStat] = []
+    with os.scandir(root) as it:
+        for entry in it:
+            name = entry.name
+            if not (name.startswith(prefix) and name.endswith(suffix)) or not entry.is_file():
+                continue
+            st = entry.stat()
+            files.append((name, st.st_mtime_ns, st.st_size))
+    if ordered:
+        files.sort(key=itemgetter(1), reverse=True)
+    return files
+
+
+def iter_newest(files: List[FileStat]) -> Iterator[FileStat]:
+    # Newest first, lazily: heapify is linear and each step costs log n, so a caller that stops
+    # after a few files never pays for a full sort. Equal mtimes keep their listing order.
+    heap = [(-entry[1], position, entry) for position, entry in enumerate(files)]
+    heapq.heapify(heap)
+    while heap:
+        yield heapq.heappop(heap)[2]
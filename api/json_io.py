@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import mmap
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in api/requirements.txt
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Reports written with the stdlib may hold NaN/Infinity, which orjson rejects.
+            pass
+    return json.loads(data)
+
+
+def dumps(payload: Any, indent: bool = True, newline: bool = False) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(payload, option=option)
+    if indent:
+        text = json.dumps(payload, indent=2)
+    else:
+        text = json.dumps(payload, separators=(",", ":"))
+    return (text + "\n" if newline else text).encode("utf-8")
+
+
+def read_json(path: Path) -> Any:
+    return loads(path.read_bytes())
+
+
+def read_json_mapped(path: Path) -> Any:
+    # Parses straight from the page cache instead of copying the file into a bytes object first.
+    with path.open("rb") as fh:
+        # Below one page the mapping setup costs more than the copy it saves.
+        if os.fstat(fh.fileno()).st_size < mmap.PAGESIZE:
+            return loads(fh.read())
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        with mapped:
+            if orjson is not None:
+                with memoryview(mapped) as view:
+                    try:
+                        return orjson.loads(view)
+                    except orjson.JSONDecodeError:
+                        pass
+            return json.loads(mapped[:])
+
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# mkstemp creates files as 0600; replaced files get the mode a plain open() would have given them.
+_FILE_MODE = 0o666 & ~_current_umask()
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> None:
+    # Readers never observe a truncated file: the rename swaps the whole content at once. Each
+    # write gets its own tmp file, so concurrent saves to one path cannot move each other's.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            os.fchmod(fh.fileno(), _FILE_MODE)
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+
+
+def write_json(path: Path, payload: Any, indent: bool = True, newline: bool = False) -> None:
+    write_bytes_atomic(path, dumps(payload, indent=indent, newline=newline))
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import JSON, Index, Integer, String, create_engine, delete, event, func, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+# (key, mtime_ns, size) for one source JSON file.
+SourceEntry = Tuple[str, int, int]
+# Builds (filter tag, response row) for a changed source file.
+RowBuilder = Callable[[str, int, int], Tuple[Optional[str], Dict[str, Any]]]
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class ListingRow(Base):
+    __tablename__ = "listings"
+    __table_args__ = (Index("ix_listings_scope_tag", "kind", "scope", "tag"),)
+
+    kind: Mapped[str] = mapped_column(String, primary_key=True)
+    scope: Mapped[str] = mapped_column(String, primary_key=True)
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    mtime_ns: Mapped[int] = mapped_column(Integer, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    tag: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    row: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+
+
+class ListingIndex:
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.engine = create_engine(f"sqlite:///{self.db_path}", future=True)
+        event.listen(self.engine, "connect", _configure_connection)
+        Base.metadata.create_all(self.engine)
+
+    def sync(self, kind: str, scope: str, sources: List[SourceEntry], build_row: RowBuilder) -> None:
+        with Session(self.engine) as session:
+            known = {
+                key: (mtime_ns, size)
+                for key, mtime_ns, size in session.execute(
+                    select(ListingRow.key, ListingRow.mtime_ns, ListingRow.size).where(
+                        ListingRow.kind == kind, ListingRow.scope == scope
+                    )
+                )
+            }
+
+            changed = False
+            for key, mtime_ns, size in sources:
+                if known.pop(key, None) == (mtime_ns, size):
+                    continue
+                tag, row = build_row(key, mtime_ns, size)
+                session.merge(
+                    ListingRow(kind=kind, scope=scope, key=key, mtime_ns=mtime_ns, size=size, tag=tag, row=row)
+                )
+                changed = True
+
+            if known:
+                session.execute(
+                    delete(ListingRow).where(
+                        ListingRow.kind == kind, ListingRow.scope == scope, ListingRow.key.in_(list(known))
+                    )
+                )
+                changed = True
+
+            if changed:
+                session.commit()
+
+    def upsert(
+        self,
+        kind: str,
+        scope: str,
+        key: str,
+        mtime_ns: int,
+        size: int,
+        tag: Optional[str],
+        row: Dict[str, Any],
+    ) -> None:
+        with Session(self.engine) as session:
+            session.merge(ListingRow(kind=kind, scope=scope, key=key, mtime_ns=mtime_ns, size=size, tag=tag, row=row))
+            session.commit()
+
+    def query(
+        self,
+        kind: str,
+        scope: str,
+        limit: int,
+        offset: int,
+        tag: Optional[str] = None,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        conditions = [ListingRow.kind == kind, ListingRow.scope == scope]
+        if tag is not None:
+            conditions.append(ListingRow.tag == tag)
+
+        with Session(self.engine) as session:
+            total = int(session.scalar(select(func.count()).select_from(ListingRow).where(*conditions)) or 0)
+            rows = session.scalars(
+                select(ListingRow.row)
+                .where(*conditions)
+                .order_by(ListingRow.mtime_ns.desc(), ListingRow.key)
+                .offset(offset)
+                .limit(limit)
+            ).all()
+
+        return total, list(rows)
+
+    def clear(self) -> None:
+        with Session(self.engine) as session:
+            session.execute(delete(ListingRow))
+            session.commit()
+
+
+def _configure_connection(dbapi_connection: Any, _connection_record: Any) -> None:
+    # Every campaign/iteration save upserts a row here; with WAL, NORMAL skips the per-commit
+    # fsync and only syncs at checkpoints, so saves pay no extra fsync for their index row.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import os
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from cbot_farm.config import load_configs
-from fastapi import Body, FastAPI, HTTPException, Query
+from fastapi import Body, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 
 from api.campaigns import CampaignOrchestrator, CampaignStore
+from api.json_io import dumps
 from api.batch_reports import BatchReportService
+from api.listing_index import ListingIndex
 from api.optimization import OptimizationService
 from api.report_index import ReportIndexService
 from api.report_reader import ReportReader
@@ -19,25 +24,28 @@ from api.strategy_workflow import StrategyWorkflowService
 
 
 ROOT = Path(__file__).resolve().parents[1]
-reader = ReportReader(reports_root=ROOT / "reports")
-campaign_store = CampaignStore(campaigns_root=ROOT / "reports" / "campaigns")
+# One set of services per process; the override lets a second checkout or a test run keep its own data.
+REPORTS_ROOT = Path(os.environ.get("CBOT_FARM_REPORTS_ROOT") or ROOT / "reports")
+index_service = ReportIndexService(reports_root=REPORTS_ROOT, db_path=REPORTS_ROOT / "index" / "reports.db")
+reader = ReportReader(reports_root=REPORTS_ROOT, index=index_service)
+listing_index = ListingIndex(db_path=REPORTS_ROOT / "index" / "listings.db")
+campaign_store = CampaignStore(campaigns_root=REPORTS_ROOT / "campaigns", index=listing_index)
 orchestrator = CampaignOrchestrator(store=campaign_store)
 optimization_service = OptimizationService(risk_config_path=ROOT / "config" / "risk.json")
-index_service = ReportIndexService(reports_root=ROOT / "reports", db_path=ROOT / "reports" / "index" / "reports.db")
-batch_service = BatchReportService(reports_root=ROOT / "reports")
+batch_service = BatchReportService(reports_root=REPORTS_ROOT, index=listing_index)
 universe_cfg, risk_cfg = load_configs()
 simulation_service = SimulationService(
-    reports_root=ROOT / "reports",
+    reports_root=REPORTS_ROOT,
     data_root=ROOT / "data" / "dukascopy",
     universe_cfg=universe_cfg,
     risk_cfg=risk_cfg,
 )
 workflow_service = StrategyWorkflowService(
-    storage_path=ROOT / "reports" / "strategy_workflow.json",
-    reports_root=ROOT / "reports",
+    storage_path=REPORTS_ROOT / "strategy_workflow.json",
+    reports_root=REPORTS_ROOT,
 )
 intake_service = StrategyIntakeService(
-    storage_dir=ROOT / "reports" / "strategy_intake",
+    storage_dir=REPORTS_ROOT / "strategy_intake",
     universe_cfg=universe_cfg,
     risk_cfg=risk_cfg,
 )
@@ -52,6 +60,11 @@ app.add_middleware(
 )
 
 
+def _json_response(payload: Dict[str, Any]) -> Response:
+    # Listing payloads are already JSON-native, so encode them once and skip response-model validation.
+    return Response(content=dumps(payload, indent=False), media_type="application/json")
+
+
 def _normalized_datetime_filter(raw: Optional[str]) -> Optional[str]:
     if raw is None:
         return None
@@ -91,19 +104,6 @@ def runs(
 ) -> Dict[str, Any]:
     from_at = _normalized_datetime_filter(from_at)
     to_at = _normalized_datetime_filter(to_at)
-    idx = index_service.status()
-    if idx.get("ready") and not idx.get("stale"):
-        return index_service.list_runs(
-            limit=limit,
-            offset=offset,
-            market=market,
-            status=status,
-            strategy_id=strategy_id,
-            symbol=symbol,
-            timeframe=timeframe,
-            from_at=from_at,
-            to_at=to_at,
-        )
     return reader.list_runs(
         limit=limit,
         offset=offset,
@@ -135,9 +135,6 @@ def ingest_manifests(
 ) -> Dict[str, Any]:
     from_at = _normalized_datetime_filter(from_at)
     to_at = _normalized_datetime_filter(to_at)
-    idx = index_service.status()
-    if idx.get("ready") and not idx.get("stale"):
-        return index_service.list_ingest_manifests(limit=limit, offset=offset, status=status, from_at=from_at, to_at=to_at)
     return reader.list_ingest_manifests(limit=limit, offset=offset, status=status, from_at=from_at, to_at=to_at)
 
 
@@ -155,8 +152,13 @@ def index_status() -> Dict[str, Any]:
 
 
 @app.post("/index/rebuild")
-def rebuild_index() -> Dict[str, Any]:
-    return index_service.rebuild()
+def rebuild_index(full: bool = False) -> Dict[str, Any]:
+    return index_service.rebuild(full=full)
+
+
+@app.post("/index/vacuum")
+def vacuum_index() -> Dict[str, Any]:
+    return index_service.vacuum()
 
 
 @app.get("/batches")
@@ -293,18 +295,37 @@ def create_campaign(payload: Dict[str, Any] = Body(default_factory=dict)) -> Dic
 
 
 @app.get("/campaigns")
-def list_campaigns(
+async def list_campaigns(
     limit: int = Query(default=50, ge=1, le=500),
     offset: int = Query(default=0, ge=0),
     status: Optional[str] = None,
-) -> Dict[str, Any]:
-    return campaign_store.list_campaigns(limit=limit, offset=offset, status=status)
+) -> Response:
+    payload = await asyncio.to_thread(campaign_store.list_campaigns, limit=limit, offset=offset, status=status)
+    return _json_response(payload)
+
+
+@app.get("/campaigns.ndjson")
+def stream_campaigns(status: Optional[str] = None) -> StreamingResponse:
+    lines = (dumps(row, indent=False, newline=True) for row in campaign_store.iter_campaign_summaries(status=status))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
 
 
 @app.get("/campaigns/{campaign_id}")
-def get_campaign(campaign_id: str) -> Dict[str, Any]:
+async def get_campaign(campaign_id: str, request: Request) -> Response:
     try:
-        return {"campaign": campaign_store.get_campaign(campaign_id)}
+        body, etag = await asyncio.to_thread(campaign_store.get_campaign_encoded, campaign_id)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=b'{"campaign":' + body + b"}", media_type="application/json", headers={"ETag": etag})
+
+
+@app.get("/campaigns/{campaign_id}/history")
+async def campaign_history(campaign_id: str) -> Dict[str, Any]:
+    try:
+        items = await asyncio.to_thread(campaign_store.load_history, campaign_id)
+        return {"campaign_id": campaign_id, "total": len(items), "items": items}
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
@@ -340,13 +361,16 @@ def cancel_campaign(campaign_id: str, payload: Dict[str, Any] = Body(default_fac
 
 
 @app.get("/campaigns/{campaign_id}/iterations")
-def campaign_iterations(
+async def campaign_iterations(
     campaign_id: str,
     limit: int = Query(default=100, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
-) -> Dict[str, Any]:
+) -> Response:
     try:
-        return campaign_store.list_iterations(campaign_id=campaign_id, limit=limit, offset=offset)
+        payload = await asyncio.to_thread(
+            campaign_store.list_iterations, campaign_id=campaign_id, limit=limit, offset=offset
+        )
+        return _json_response(payload)
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
@@ -431,9 +455,9 @@ def campaign_loop_tick(
 
 
 @app.get("/campaigns/{campaign_id}/artifacts")
-def campaign_artifacts(campaign_id: str) -> Dict[str, Any]:
+async def campaign_artifacts(campaign_id: str) -> Response:
     try:
-        return campaign_store.list_artifacts(campaign_id=campaign_id)
+        return _json_response(await asyncio.to_thread(campaign_store.list_artifacts, campaign_id=campaign_id))
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
@@ -1,25 +1,63 @@
 from __future__ import annotations
 
-import copy
-import json
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
 
+from api.json_io import read_json, write_json
 from cbot_farm.param_optimization import build_param_plan
 
 
+def _freeze(value: Any) -> Any:
+    # The cached risk config is shared by every reader, so it is made read-only once instead of
+    # deep-copied per call.
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _with_space(risk: Mapping[str, Any], strategy_id: str, space: Dict[str, Any]) -> Dict[str, Any]:
+    # build_param_plan only reads the config, so splicing the space in needs shallow copies
+    # along optimization.parameter_space rather than a deep copy of the whole tree.
+    optimization = risk.get("optimization", {})
+    return {
+        **risk,
+        "optimization": {
+            **optimization,
+            "parameter_space": {**optimization.get("parameter_space", {}), strategy_id: space},
+        },
+    }
+
+
 class OptimizationService:
     def __init__(self, risk_config_path: Path) -> None:
         self.risk_config_path = risk_config_path
+        self._risk_cache: Optional[Tuple[int, int, Mapping[str, Any]]] = None
 
-    def _load_risk(self) -> Dict[str, Any]:
-        with self.risk_config_path.open("r", encoding="utf-8") as fh:
-            return json.load(fh)
+    def _load_risk(self) -> Mapping[str, Any]:
+        st = self.risk_config_path.stat()
+        cached = self._risk_cache
+        if cached is None or cached[0] != st.st_mtime_ns or cached[1] != st.st_size:
+            cached = (st.st_mtime_ns, st.st_size, _freeze(read_json(self.risk_config_path)))
+            self._risk_cache = cached
+        return cached[2]
 
     def _save_risk(self, payload: Dict[str, Any]) -> None:
-        with self.risk_config_path.open("w", encoding="utf-8") as fh:
-            json.dump(payload, fh, indent=2)
-            fh.write("\n")
+        write_json(self.risk_config_path, payload, newline=True)
+        # Re-stat after the replace so the cache key matches the file now on disk.
+        st = self.risk_config_path.stat()
+        self._risk_cache = (st.st_mtime_ns, st.st_size, _freeze(payload))
 
     def list_spaces(self) -> Dict[str, Any]:
         risk = self._load_risk()
@@ -27,32 +65,43 @@ class OptimizationService:
 
         items = []
         for strategy_id, space in spaces.items():
-            params = space.get("parameters", {}) if isinstance(space, dict) else {}
-            enabled_count = sum(1 for spec in params.values() if bool(spec.get("enabled", True)))
+            if not isinstance(space, Mapping):
+                items.append(
+                    {
+                        "strategy_id": strategy_id,
+                        "parameters_total": 0,
+                        "parameters_enabled": 0,
+                        "search_mode": "grid",
+                        "max_combinations": 0,
+                    }
+                )
+                continue
+            get = space.get
+            params = get("parameters", {})
             items.append(
                 {
                     "strategy_id": strategy_id,
                     "parameters_total": len(params),
-                    "parameters_enabled": enabled_count,
-                    "search_mode": space.get("search_mode", "grid") if isinstance(space, dict) else "grid",
-                    "max_combinations": int(space.get("max_combinations", 0)) if isinstance(space, dict) else 0,
+                    "parameters_enabled": sum(1 for spec in params.values() if spec.get("enabled", True)),
+                    "search_mode": get("search_mode", "grid"),
+                    "max_combinations": int(get("max_combinations", 0)),
                 }
             )
 
-        items.sort(key=lambda x: x["strategy_id"])
+        items.sort(key=itemgetter("strategy_id"))
         return {"total": len(items), "items": items}
 
     def get_space(self, strategy_id: str) -> Dict[str, Any]:
         risk = self._load_risk()
         spaces = risk.get("optimization", {}).get("parameter_space", {})
         space = spaces.get(strategy_id)
-        if not isinstance(space, dict):
+        if not isinstance(space, Mapping):
             raise FileNotFoundError(f"optimization space not found for strategy: {strategy_id}")
 
         plan = build_param_plan(strategy_id=strategy_id, risk_cfg=risk)
         return {
             "strategy_id": strategy_id,
-            "space": space,
+            "space": _thaw(space),
             "preview": {
                 "total_candidates": int(plan.get("total_candidates", 0)),
                 "raw_total_candidates": int(plan.get("raw_total_candidates", 0)),
@@ -67,14 +116,12 @@ class OptimizationService:
         if not isinstance(space_payload, dict) or "parameters" not in space_payload:
             raise ValueError("invalid optimization space payload")
 
-        risk = self._load_risk()
-        risk.setdefault("optimization", {}).setdefault("parameter_space", {})[strategy_id] = space_payload
+        risk = _with_space(self._load_risk(), strategy_id, space_payload)
 
-        # Validate by attempting plan build on an in-memory copy.
-        risk_copy = copy.deepcopy(risk)
-        _ = build_param_plan(strategy_id=strategy_id, risk_cfg=risk_copy)
+        # Validate by attempting plan build before anything is written.
+        _ = build_param_plan(strategy_id=strategy_id, risk_cfg=risk)
 
-        self._save_risk(risk)
+        self._save_risk(_thaw(risk))
         return self.get_space(strategy_id)
 
     def preview_space(self, strategy_id: str, override_payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -83,8 +130,7 @@ class OptimizationService:
         if override_payload is not None:
             if not isinstance(override_payload, dict) or "parameters" not in override_payload:
                 raise ValueError("invalid optimization space payload")
-            risk = copy.deepcopy(risk)
-            risk.setdefault("optimization", {}).setdefault("parameter_space", {})[strategy_id] = override_payload
+            risk = _with_space(risk, strategy_id, override_payload)
 
         plan = build_param_plan(strategy_id=strategy_id, risk_cfg=risk)
         return {
@@ -1,13 +1,45 @@
 from __future__ import annotations
 
-import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from itertools import repeat
 from pathlib import Path
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 
+from api.fs_scan import FileStat, dir_file_stats
+from api.json_io import read_json
 from cbot_farm.report_schema import migrate_report_payload
-from sqlalchemy import Float, Integer, String, create_engine, func, select
-from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from sqlalchemy import (
+    Computed,
+    Connection,
+    Float,
+    Index,
+    Integer,
+    String,
+    create_engine,
+    delete,
+    event,
+    func,
+    insert,
+    select,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+_MAX_LOAD_WORKERS = 8
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+# Bumped whenever the tables change shape; an index file on an older version is dropped and
+# rebuilt from the reports, since create_all never alters existing tables.
+_SCHEMA_VERSION = 2
+# Keys per IN (...) clause, well under SQLite's bound-parameter limit.
+_DELETE_CHUNK = 500
+
+# The index is fully rebuildable from the report files, so a rebuild trades crash durability for
+# speed: no fsync per commit, temp b-trees in memory and a 64 MiB page cache.
+_BULK_PRAGMAS = (("synchronous", "OFF"), ("temp_store", "MEMORY"), ("cache_size", "-65536"))
 
 
 def _to_float(v: Any) -> Optional[float]:
@@ -35,12 +67,56 @@ def _normalize_datetime_filter(raw: Optional[str]) -> Optional[str]:
     return dt.isoformat()
 
 
+@contextmanager
+def _bulk_pragmas(connection: Connection) -> Iterator[None]:
+    # Pooled connections are reused by readers, so the previous settings are put back afterwards.
+    previous = [(name, connection.exec_driver_sql(f"PRAGMA {name}").scalar()) for name, _ in _BULK_PRAGMAS]
+    for name, value in _BULK_PRAGMAS:
+        connection.exec_driver_sql(f"PRAGMA {name}={value}")
+    try:
+        yield
+    finally:
+        # PRAGMA synchronous cannot change inside a transaction, e.g. after a failed insert.
+        connection.rollback()
+        for name, value in previous:
+            connection.exec_driver_sql(f"PRAGMA {name}={value}")
+
+
+def _scan(root: Path, prefix: str) -> List[FileStat]:
+    try:
+        return dir_file_stats(root, prefix, ".json")
+    except FileNotFoundError:
+        return []
+
+
+def _chunks(keys: List[str]) -> Iterator[List[str]]:
+    for start in range(0, len(keys), _DELETE_CHUNK):
+        yield keys[start : start + _DELETE_CHUNK]
+
+
+def _upsert_statement(model: Any) -> Any:
+    # Rewritten reports update their row in place instead of leaving a deleted slot behind.
+    stmt = sqlite_insert(model)
+    columns = [column.name for column in model.__table__.columns if not column.primary_key and column.computed is None]
+    return stmt.on_conflict_do_update(
+        index_elements=[column.name for column in model.__table__.primary_key],
+        set_={name: stmt.excluded[name] for name in columns},
+    )
+
+
 class Base(DeclarativeBase):
     pass
 
 
 class RunIndex(Base):
     __tablename__ = "runs"
+    # Listings page newest-first, optionally filtered by market or status; these let SQLite walk
+    # an index in order instead of sorting every matching row for each page.
+    __table_args__ = (
+        Index("ix_runs_sort_key", "sort_key", "run_id"),
+        Index("ix_runs_market_sort", "market_lc", "sort_key", "run_id"),
+        Index("ix_runs_status_sort", "status", "sort_key", "run_id"),
+    )
 
     run_id: Mapped[str] = mapped_column(String, primary_key=True)
     filename: Mapped[str] = mapped_column(String, nullable=False)
@@ -56,10 +132,14 @@ class RunIndex(Base):
     max_drawdown_pct: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     oos_degradation_pct: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     indexed_at: Mapped[str] = mapped_column(String, nullable=False)
+    sort_key: Mapped[str] = mapped_column(String, Computed("coalesce(run_at, indexed_at)", persisted=True))
+    # status is already stored lowercase; market keeps its original case for display.
+    market_lc: Mapped[Optional[str]] = mapped_column(String, Computed("lower(market)", persisted=True))
 
 
 class IngestManifestIndex(Base):
     __tablename__ = "ingest_manifests"
+    __table_args__ = (Index("ix_ingest_manifests_sort_key", "sort_key", "manifest_id"),)
 
     manifest_id: Mapped[str] = mapped_column(String, primary_key=True)
     filename: Mapped[str] = mapped_column(String, nullable=False)
@@ -69,6 +149,27 @@ class IngestManifestIndex(Base):
     ok_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     failed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     indexed_at: Mapped[str] = mapped_column(String, nullable=False)
+    sort_key: Mapped[str] = mapped_column(String, Computed("coalesce(created_at, indexed_at)", persisted=True))
+
+
+class IndexedFile(Base):
+    __tablename__ = "file_state"
+
+    path: Mapped[str] = mapped_column(String, primary_key=True)
+    mtime_ns: Mapped[int] = mapped_column(Integer, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+# Built once so every rebuild reuses the same statement objects: SQLAlchemy's compiled cache and
+# the driver's prepared-statement cache both hit from the first executemany onwards.
+_INSERT_RUNS = insert(RunIndex)
+_INSERT_MANIFESTS = insert(IngestManifestIndex)
+_INSERT_FILES = insert(IndexedFile)
+_UPSERT_RUNS = _upsert_statement(RunIndex)
+_UPSERT_MANIFESTS = _upsert_statement(IngestManifestIndex)
+_UPSERT_FILES = _upsert_statement(IndexedFile)
+# Prepared statements the sqlite3 driver keeps per connection (its default is 128).
+_CACHED_STATEMENTS = 256
 
 
 class ReportIndexService:
@@ -78,26 +179,36 @@ class ReportIndexService:
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        self.engine = create_engine(f"sqlite:///{self.db_path}", future=True)
-        Base.metadata.create_all(self.engine)
+        self.engine = create_engine(
+            f"sqlite:///{self.db_path}",
+            future=True,
+            connect_args={"cached_statements": _CACHED_STATEMENTS},
+        )
+        event.listen(self.engine, "connect", _configure_connection)
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        with self.engine.connect() as connection:
+            if connection.exec_driver_sql("PRAGMA user_version").scalar() != _SCHEMA_VERSION:
+                # Dropping file_state too makes the next rebuild a full one.
+                Base.metadata.drop_all(connection)
+                connection.exec_driver_sql(f"PRAGMA user_version={_SCHEMA_VERSION}")
+            Base.metadata.create_all(connection)
+            connection.commit()
 
     def _load_json(self, path: Path) -> Dict[str, Any]:
-        with path.open("r", encoding="utf-8") as fh:
-            payload = json.load(fh)
-        return migrate_report_payload(payload, path=path)
+        return migrate_report_payload(read_json(path), path=path)
+
+    def _source_files(self) -> Tuple[List[FileStat], List[FileStat]]:
+        return _scan(self.reports_root, "run_"), _scan(self.ingest_root, "manifest_")
 
     def _latest_source_mtime(self) -> Optional[datetime]:
-        latest_ts = 0.0
-        for path in self.reports_root.glob("run_*.json"):
-            if path.is_file():
-                latest_ts = max(latest_ts, path.stat().st_mtime)
-        for path in self.ingest_root.glob("manifest_*.json"):
-            if path.is_file():
-                latest_ts = max(latest_ts, path.stat().st_mtime)
-
-        if latest_ts <= 0.0:
+        run_files, manifest_files = self._source_files()
+        # Both lists are newest first.
+        latest_ns = max([files[0][1] for files in (run_files, manifest_files) if files], default=0)
+        if latest_ns <= 0:
             return None
-        return datetime.fromtimestamp(latest_ts, tz=timezone.utc)
+        return datetime.fromtimestamp(latest_ns / 1e9, tz=timezone.utc)
 
     def _parse_indexed_at(self, raw: Optional[str]) -> Optional[datetime]:
         if not raw:
@@ -111,96 +222,174 @@ class ReportIndexService:
         except ValueError:
             return None
 
-    def rebuild(self) -> Dict[str, Any]:
+    def _run_row(self, path: Path, indexed_at: str) -> Dict[str, Any]:
+        payload = self._load_json(path)
+        # Nested sections are looked up once; missing ones share one empty mapping.
+        target = payload.get("target") or _EMPTY
+        backtest = payload.get("backtest") or _EMPTY
+        strategy_name = payload.get("strategy")
+        strategy_id = payload.get("strategy_id")
+        if isinstance(strategy_name, dict):
+            if strategy_id is None:
+                strategy_id = strategy_name.get("strategy_id")
+            strategy_name = strategy_name.get("name")
+
+        timeframe = target.get("timeframe")
+        if timeframe is None:
+            timeframes = payload.get("timeframes")
+            if isinstance(timeframes, list) and timeframes:
+                timeframe = timeframes[0]
+
+        run_status = str(
+            payload.get("status")
+            or backtest.get("status")
+            or (payload.get("ingest") or _EMPTY).get("status")
+            or "unknown"
+        ).lower()
+
+        metrics = payload.get("metrics") or backtest.get("metrics") or _EMPTY
+
+        return {
+            "run_id": path.stem,
+            "filename": path.name,
+            "run_at": payload.get("run_at") or payload.get("created_at"),
+            "status": run_status,
+            "strategy": strategy_name,
+            "strategy_id": strategy_id,
+            "market": payload.get("market") or target.get("market"),
+            "symbol": payload.get("symbol") or target.get("symbol"),
+            "timeframe": timeframe,
+            "total_return_pct": _to_float(metrics.get("total_return_pct")),
+            "sharpe": _to_float(metrics.get("sharpe")),
+            "max_drawdown_pct": _to_float(metrics.get("max_drawdown_pct")),
+            "oos_degradation_pct": _to_float(metrics.get("oos_degradation_pct")),
+            "indexed_at": indexed_at,
+        }
+
+    def _manifest_row(self, path: Path, indexed_at: str) -> Dict[str, Any]:
+        # Migration deep-copies every result row only to add a summary and leaves created_at and
+        # status alone, so the row is built from the raw payload and the results are counted once.
+        payload = read_json(path)
+        results = payload.get("results")
+        if not isinstance(results, list):
+            results = []
+        # Statuses repeat a handful of values, so only the distinct ones are normalized.
+        statuses = Counter([r.get("status", "") for r in results])
+        ok_count = sum(n for value, n in statuses.items() if str(value).lower() == "ok")
+        return {
+            "manifest_id": path.stem,
+            "filename": path.name,
+            "created_at": payload.get("created_at"),
+            "status": payload.get("status"),
+            "rows_count": len(results),
+            "ok_count": ok_count,
+            "failed_count": len(results) - ok_count,
+            "indexed_at": indexed_at,
+        }
+
+    def rebuild(self, full: bool = False) -> Dict[str, Any]:
         now = datetime.now(timezone.utc).isoformat()
 
-        run_files = sorted([p for p in self.reports_root.glob("run_*.json") if p.is_file()])
-        manifest_files = sorted([p for p in self.ingest_root.glob("manifest_*.json") if p.is_file()])
-
-        with Session(self.engine) as session:
-            session.query(RunIndex).delete()
-            session.query(IngestManifestIndex).delete()
-
-            run_rows = []
-            for path in run_files:
-                payload = self._load_json(path)
-                strategy_name = payload.get("strategy")
-                strategy_id = payload.get("strategy_id")
-                if isinstance(strategy_name, dict):
-                    strategy_name = strategy_name.get("name")
-                    if strategy_id is None:
-                        strategy_id = payload.get("strategy", {}).get("strategy_id")
-
-                timeframe = payload.get("target", {}).get("timeframe")
-                if timeframe is None:
-                    timeframes = payload.get("timeframes")
-                    if isinstance(timeframes, list) and timeframes:
-                        timeframe = timeframes[0]
-
-                run_status = str(
-                    payload.get("status")
-                    or payload.get("backtest", {}).get("status")
-                    or payload.get("ingest", {}).get("status")
-                    or "unknown"
-                ).lower()
-
-                metrics = payload.get("metrics") or payload.get("backtest", {}).get("metrics", {})
-
-                run_rows.append(
-                    RunIndex(
-                        run_id=path.stem,
-                        filename=path.name,
-                        run_at=payload.get("run_at") or payload.get("created_at"),
-                        status=run_status,
-                        strategy=strategy_name,
-                        strategy_id=strategy_id,
-                        market=payload.get("market") or payload.get("target", {}).get("market"),
-                        symbol=payload.get("symbol") or payload.get("target", {}).get("symbol"),
-                        timeframe=timeframe,
-                        total_return_pct=_to_float(metrics.get("total_return_pct")),
-                        sharpe=_to_float(metrics.get("sharpe")),
-                        max_drawdown_pct=_to_float(metrics.get("max_drawdown_pct")),
-                        oos_degradation_pct=_to_float(metrics.get("oos_degradation_pct")),
-                        indexed_at=now,
-                    )
-                )
-
-            manifest_rows = []
-            for path in manifest_files:
-                payload = self._load_json(path)
-                results = payload.get("results", [])
-                ok_count = sum(1 for r in results if str(r.get("status", "")).lower() == "ok")
-                failed_count = len(results) - ok_count
-                manifest_rows.append(
-                    IngestManifestIndex(
-                        manifest_id=path.stem,
-                        filename=path.name,
-                        created_at=payload.get("created_at"),
-                        status=payload.get("status"),
-                        rows_count=len(results),
-                        ok_count=ok_count,
-                        failed_count=failed_count,
-                        indexed_at=now,
+        run_files, manifest_files = self._source_files()
+
+        # Keys are paths relative to reports_root; names come straight from the directory entries.
+        current: Dict[str, Tuple[Path, int, int]] = {}
+        for name, mtime_ns, size in sorted(run_files):
+            current[name] = (self.reports_root / name, mtime_ns, size)
+        for name, mtime_ns, size in sorted(manifest_files):
+            current[f"ingest/{name}"] = (self.ingest_root / name, mtime_ns, size)
+
+        known: Dict[str, Tuple[int, int]] = {}
+        if not full:
+            with self.engine.connect() as connection:
+                known = {
+                    key: (mtime_ns, size)
+                    for key, mtime_ns, size in connection.execute(
+                        select(IndexedFile.path, IndexedFile.mtime_ns, IndexedFile.size)
                     )
-                )
-
-            session.add_all(run_rows)
-            session.add_all(manifest_rows)
-            session.commit()
+                }
+            # An index built before file_state existed cannot tell which of its rows are orphaned.
+            full = not known
+
+        # Only new or rewritten files are parsed; unchanged ones keep their rows.
+        changed = [key for key, (_, mtime_ns, size) in current.items() if known.get(key) != (mtime_ns, size)]
+        removed = [key for key in known if key not in current]
+        changed_runs = [current[key][0] for key in changed if current[key][0].parent == self.reports_root]
+        changed_manifests = [current[key][0] for key in changed if current[key][0].parent != self.reports_root]
+
+        # Each worker loads one file and keeps only its row, so full payloads never pile up.
+        with ThreadPoolExecutor(max_workers=_MAX_LOAD_WORKERS) as executor:
+            run_rows = list(executor.map(self._run_row, changed_runs, repeat(now)))
+            manifest_rows = list(executor.map(self._manifest_row, changed_manifests, repeat(now)))
+
+        file_rows = [{"path": key, "mtime_ns": current[key][1], "size": current[key][2]} for key in changed]
+
+        # Parse everything first, then apply the changes in one transaction: each list goes to
+        # the driver as a single executemany of one prepared statement. That already beats batched
+        # multi-row VALUES here: SQLAlchemy only pages inserts that way for INSERT .. RETURNING on
+        # SQLite, and rendering large VALUES lists by hand costs more than the VDBE steps it saves.
+        with self.engine.connect() as connection, _bulk_pragmas(connection):
+            if full:
+                connection.execute(delete(RunIndex))
+                connection.execute(delete(IngestManifestIndex))
+                connection.execute(delete(IndexedFile))
+                if run_rows:
+                    connection.execute(_INSERT_RUNS, run_rows)
+                if manifest_rows:
+                    connection.execute(_INSERT_MANIFESTS, manifest_rows)
+                if file_rows:
+                    connection.execute(_INSERT_FILES, file_rows)
+            else:
+                # Run and manifest stems never collide (run_* vs manifest_*), so one key list serves both.
+                for keys in _chunks(removed):
+                    stems = [Path(key).stem for key in keys]
+                    connection.execute(delete(RunIndex).where(RunIndex.run_id.in_(stems)))
+                    connection.execute(delete(IngestManifestIndex).where(IngestManifestIndex.manifest_id.in_(stems)))
+                    connection.execute(delete(IndexedFile).where(IndexedFile.path.in_(keys)))
+                if run_rows:
+                    connection.execute(_UPSERT_RUNS, run_rows)
+                if manifest_rows:
+                    connection.execute(_UPSERT_MANIFESTS, manifest_rows)
+                if file_rows:
+                    connection.execute(_UPSERT_FILES, file_rows)
+            connection.commit()
+            self._optimize(connection)
 
         return {
             "runs_indexed": len(run_files),
             "manifests_indexed": len(manifest_files),
+            "runs_reindexed": len(run_rows),
+            "manifests_reindexed": len(manifest_rows),
+            "files_removed": len(removed),
             "indexed_at": now,
             "db_path": str(self.db_path),
         }
 
+    def _optimize(self, connection: Connection) -> None:
+        # Cheap when nothing changed: SQLite only re-analyzes tables whose stats drifted.
+        connection.exec_driver_sql("PRAGMA optimize")
+        connection.commit()
+
+    def optimize(self) -> None:
+        with self.engine.connect() as connection:
+            self._optimize(connection)
+
+    def vacuum(self) -> Dict[str, Any]:
+        # VACUUM rewrites the whole file and cannot run inside a transaction, so it stays on demand.
+        # Checkpointing around it folds the WAL back in, so the sizes describe the real database.
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+            size_before = self.db_path.stat().st_size
+            connection.exec_driver_sql("VACUUM")
+            connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        return {"db_path": str(self.db_path), "bytes_before": size_before, "bytes_after": self.db_path.stat().st_size}
+
     def status(self) -> Dict[str, Any]:
-        with Session(self.engine) as session:
-            runs_count = int(session.scalar(select(func.count()).select_from(RunIndex)) or 0)
-            manifests_count = int(session.scalar(select(func.count()).select_from(IngestManifestIndex)) or 0)
-            max_runs_idx = session.scalar(select(func.max(RunIndex.indexed_at)))
-            max_manifest_idx = session.scalar(select(func.max(IngestManifestIndex.indexed_at)))
+        with self.engine.connect() as connection:
+            runs_count = int(connection.scalar(select(func.count()).select_from(RunIndex)) or 0)
+            manifests_count = int(connection.scalar(select(func.count()).select_from(IngestManifestIndex)) or 0)
+            max_runs_idx = connection.scalar(select(func.max(RunIndex.indexed_at)))
+            max_manifest_idx = connection.scalar(select(func.max(IngestManifestIndex.indexed_at)))
 
         last_indexed_at = max_runs_idx or max_manifest_idx
         latest_source_dt = self._latest_source_mtime()
@@ -234,31 +423,34 @@ class ReportIndexService:
     ) -> Dict[str, Any]:
         from_filter = _normalize_datetime_filter(from_at)
         to_filter = _normalize_datetime_filter(to_at)
-        with Session(self.engine) as session:
-            query = session.query(RunIndex)
-
-            if market:
-                query = query.filter(func.lower(RunIndex.market) == market.lower())
-            if status:
-                query = query.filter(func.lower(RunIndex.status) == status.lower())
-            if strategy_id:
-                query = query.filter(func.lower(RunIndex.strategy_id) == strategy_id.lower())
-            if symbol:
-                query = query.filter(func.lower(RunIndex.symbol) == symbol.lower())
-            if timeframe:
-                query = query.filter(func.lower(RunIndex.timeframe) == timeframe.lower())
-            if from_filter:
-                query = query.filter(func.coalesce(RunIndex.run_at, RunIndex.indexed_at) >= from_filter)
-            if to_filter:
-                query = query.filter(func.coalesce(RunIndex.run_at, RunIndex.indexed_at) <= to_filter)
-
-            total = int(query.count())
-            rows = (
-                query.order_by(func.coalesce(RunIndex.run_at, RunIndex.indexed_at).desc())
+        conditions = []
+        if market:
+            conditions.append(RunIndex.market_lc == market.lower())
+        if status:
+            conditions.append(RunIndex.status == status.lower())
+        if strategy_id:
+            conditions.append(func.lower(RunIndex.strategy_id) == strategy_id.lower())
+        if symbol:
+            conditions.append(func.lower(RunIndex.symbol) == symbol.lower())
+        if timeframe:
+            conditions.append(func.lower(RunIndex.timeframe) == timeframe.lower())
+        if from_filter:
+            conditions.append(RunIndex.sort_key >= from_filter)
+        if to_filter:
+            conditions.append(RunIndex.sort_key <= to_filter)
+
+        count = select(func.count()).select_from(RunIndex).where(*conditions)
+        with self.engine.connect() as connection:
+            # The uncorrelated count is evaluated once and rides along on every row of the page.
+            rows = connection.execute(
+                select(RunIndex.__table__, count.scalar_subquery().label("total"))
+                .where(*conditions)
+                .order_by(RunIndex.sort_key.desc(), RunIndex.run_id.desc())
                 .offset(offset)
                 .limit(limit)
-                .all()
-            )
+            ).all()
+            # A page past the end has no row to carry the total.
+            total = rows[0].total if rows else (int(connection.scalar(count) or 0) if offset else 0)
 
         items = []
         for r in rows:
@@ -294,23 +486,24 @@ class ReportIndexService:
     ) -> Dict[str, Any]:
         from_filter = _normalize_datetime_filter(from_at)
         to_filter = _normalize_datetime_filter(to_at)
-        with Session(self.engine) as session:
-            query = session.query(IngestManifestIndex)
-
-            if status:
-                query = query.filter(func.lower(IngestManifestIndex.status) == status.lower())
-            if from_filter:
-                query = query.filter(func.coalesce(IngestManifestIndex.created_at, IngestManifestIndex.indexed_at) >= from_filter)
-            if to_filter:
-                query = query.filter(func.coalesce(IngestManifestIndex.created_at, IngestManifestIndex.indexed_at) <= to_filter)
-
-            total = int(query.count())
-            rows = (
-                query.order_by(func.coalesce(IngestManifestIndex.created_at, IngestManifestIndex.indexed_at).desc())
+        conditions = []
+        if status:
+            conditions.append(func.lower(IngestManifestIndex.status) == status.lower())
+        if from_filter:
+            conditions.append(IngestManifestIndex.sort_key >= from_filter)
+        if to_filter:
+            conditions.append(IngestManifestIndex.sort_key <= to_filter)
+
+        count = select(func.count()).select_from(IngestManifestIndex).where(*conditions)
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                select(IngestManifestIndex.__table__, count.scalar_subquery().label("total"))
+                .where(*conditions)
+                .order_by(IngestManifestIndex.sort_key.desc(), IngestManifestIndex.manifest_id.desc())
                 .offset(offset)
                 .limit(limit)
-                .all()
-            )
+            ).all()
+            total = rows[0].total if rows else (int(connection.scalar(count) or 0) if offset else 0)
 
         items = []
         for r in rows:
@@ -327,3 +520,12 @@ class ReportIndexService:
             )
 
         return {"total": total, "limit": limit, "offset": offset, "items": items}
+
+
+def _configure_connection(dbapi_connection: Any, _connection_record: Any) -> None:
+    # Pooled connections are reused across requests; WAL lets list/status reads proceed while a
+    # rebuild is writing, and NORMAL only syncs at checkpoints in WAL mode.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
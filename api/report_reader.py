@@ -1,22 +1,58 @@
 from __future__ import annotations
 
-import json
+import copy
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 
+from api.fs_scan import dir_file_stats
+from api.json_io import read_json, read_json_mapped
+from api.report_index import ReportIndexService
 from cbot_farm.report_schema import migrate_report_payload
 
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+# Reports above this size are parsed per request instead of being pinned in the detail cache.
+_DETAIL_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+
+def _parse_detail(path: Path) -> dict[str, Any]:
+    # Single reports can be large (full trade logs), so they parse from a mapping.
+    return migrate_report_payload(read_json_mapped(path), path=path)
+
+
+@lru_cache(maxsize=16)
+def _load_detail_cached(path_str: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    # Keyed by (path, mtime_ns, size) so a rewritten report is reparsed automatically.
+    return _parse_detail(Path(path_str))
+
 
 class ReportReader:
-    def __init__(self, reports_root: Path) -> None:
+    def __init__(self, reports_root: Path, index: Optional[ReportIndexService] = None) -> None:
         self.reports_root = reports_root
         self.ingest_root = reports_root / "ingest"
+        self.index = index
+
+    def _index_ready(self) -> bool:
+        # Listings come from the SQLite index whenever it is built and current; scanning the
+        # report files is the fallback.
+        if self.index is None:
+            return False
+        status = self.index.status()
+        return bool(status.get("ready")) and not status.get("stale")
 
     def _load_json(self, path: Path) -> dict[str, Any]:
-        with path.open("r", encoding="utf-8") as fh:
-            payload = json.load(fh)
-        return migrate_report_payload(payload, path=path)
+        return migrate_report_payload(read_json(path), path=path)
+
+    def _load_detail(self, path: Path) -> dict[str, Any]:
+        # Callers get their own top-level dict, but nested values of cached reports are shared with
+        # the cache and must be treated as read-only.
+        st = path.stat()
+        if st.st_size > _DETAIL_CACHE_MAX_BYTES:
+            return _parse_detail(path)
+        return copy.copy(_load_detail_cached(str(path), st.st_mtime_ns, st.st_size))
 
     def _parse_datetime(self, raw: Any) -> Optional[datetime]:
         if not isinstance(raw, str) or not raw.strip():
@@ -26,6 +62,52 @@ class ReportReader:
         except ValueError:
             return None
 
+    def _report_files(self, root: Path, prefix: str) -> list[Path]:
+        # One scandir pass with the stat each entry already carries; newest first.
+        try:
+            stats = dir_file_stats(root, prefix, ".json")
+        except FileNotFoundError:
+            return []
+        return [root / name for name, _, _ in stats]
+
+    def _run_item(self, path: Path) -> dict[str, Any]:
+        payload = self._load_json(path)
+        target = payload.get("target") or _EMPTY
+        backtest = payload.get("backtest") or _EMPTY
+        strategy_name = payload.get("strategy")
+        run_strategy_id = payload.get("strategy_id")
+        if isinstance(strategy_name, dict):
+            if run_strategy_id is None:
+                run_strategy_id = strategy_name.get("strategy_id")
+            strategy_name = strategy_name.get("name")
+
+        run_timeframe = target.get("timeframe")
+        if run_timeframe is None:
+            timeframes = payload.get("timeframes")
+            if isinstance(timeframes, list) and timeframes:
+                run_timeframe = timeframes[0]
+
+        run_status = str(
+            payload.get("status")
+            or backtest.get("status")
+            or (payload.get("ingest") or _EMPTY).get("status")
+            or "unknown"
+        ).lower()
+
+        return {
+            "run_id": path.stem,
+            "external_run_id": payload.get("run_id"),
+            "filename": path.name,
+            "run_at": payload.get("run_at") or payload.get("created_at"),
+            "status": run_status,
+            "strategy": strategy_name,
+            "strategy_id": run_strategy_id,
+            "market": payload.get("market") or target.get("market"),
+            "symbol": payload.get("symbol") or target.get("symbol"),
+            "timeframe": run_timeframe,
+            "metrics": payload.get("metrics") or backtest.get("metrics", {}),
+        }
+
     def list_runs(
         self,
         limit: int = 50,
@@ -38,74 +120,48 @@ class ReportReader:
         from_at: Optional[str] = None,
         to_at: Optional[str] = None,
     ) -> dict[str, Any]:
-        files = sorted(
-            [p for p in self.reports_root.glob("run_*.json") if p.is_file()],
-            key=lambda p: p.stat().st_mtime,
-            reverse=True,
-        )
+        if self._index_ready():
+            return self.index.list_runs(
+                limit=limit,
+                offset=offset,
+                market=market,
+                status=status,
+                strategy_id=strategy_id,
+                symbol=symbol,
+                timeframe=timeframe,
+                from_at=from_at,
+                to_at=to_at,
+            )
+
+        files = self._report_files(self.reports_root, "run_")
+        if not (market or status or strategy_id or symbol or timeframe or from_at or to_at):
+            # Unfiltered pages only need the files they return parsed.
+            items = [self._run_item(path) for path in files[offset : offset + limit]]
+            return {"total": len(files), "limit": limit, "offset": offset, "items": items}
 
         from_dt = self._parse_datetime(from_at)
         to_dt = self._parse_datetime(to_at)
         items: list[dict[str, Any]] = []
         for path in files:
-            payload = self._load_json(path)
+            item = self._run_item(path)
 
-            run_market = str(payload.get("market") or payload.get("target", {}).get("market") or "").lower()
-            run_status = str(
-                payload.get("status")
-                or payload.get("backtest", {}).get("status")
-                or payload.get("ingest", {}).get("status")
-                or "unknown"
-            ).lower()
-
-            if market and run_market != market.lower():
+            if market and str(item["market"] or "").lower() != market.lower():
                 continue
-            if status and run_status != status.lower():
+            if status and item["status"] != status.lower():
                 continue
-
-            strategy_name = payload.get("strategy")
-            run_strategy_id = payload.get("strategy_id")
-            if isinstance(strategy_name, dict):
-                strategy_name = strategy_name.get("name")
-                if run_strategy_id is None:
-                    run_strategy_id = payload.get("strategy", {}).get("strategy_id")
-
-            run_timeframe = payload.get("target", {}).get("timeframe")
-            if run_timeframe is None:
-                timeframes = payload.get("timeframes")
-                if isinstance(timeframes, list) and timeframes:
-                    run_timeframe = timeframes[0]
-
-            run_symbol = payload.get("symbol") or payload.get("target", {}).get("symbol")
-            run_at = payload.get("run_at") or payload.get("created_at")
-            run_dt = self._parse_datetime(run_at)
-
-            if strategy_id and str(run_strategy_id or "").lower() != strategy_id.lower():
+            if strategy_id and str(item["strategy_id"] or "").lower() != strategy_id.lower():
                 continue
-            if symbol and str(run_symbol or "").lower() != symbol.lower():
+            if symbol and str(item["symbol"] or "").lower() != symbol.lower():
                 continue
-            if timeframe and str(run_timeframe or "").lower() != timeframe.lower():
+            if timeframe and str(item["timeframe"] or "").lower() != timeframe.lower():
                 continue
+            run_dt = self._parse_datetime(item["run_at"])
             if from_dt and (run_dt is None or run_dt < from_dt):
                 continue
             if to_dt and (run_dt is None or run_dt > to_dt):
                 continue
 
-            items.append(
-                {
-                    "run_id": path.stem,
-                    "external_run_id": payload.get("run_id"),
-                    "filename": path.name,
-                    "run_at": payload.get("run_at") or payload.get("created_at"),
-                    "status": run_status,
-                    "strategy": strategy_name,
-                    "strategy_id": run_strategy_id,
-                    "market": payload.get("market") or payload.get("target", {}).get("market"),
-                    "symbol": run_symbol,
-                    "timeframe": run_timeframe,
-                    "metrics": payload.get("metrics") or payload.get("backtest", {}).get("metrics", {}),
-                }
-            )
+            items.append(item)
 
         total = len(items)
         page = items[offset : offset + limit]
@@ -119,9 +175,28 @@ class ReportReader:
         path = next((p for p in candidates if p.exists()), None)
         if path is None:
             raise FileNotFoundError(f"run not found: {run_id}")
-        payload = self._load_json(path)
+        payload = self._load_detail(path)
         return {"run_id": path.stem, "payload": payload}
 
+    def _manifest_item(self, path: Path) -> dict[str, Any]:
+        # Listing rows only count results; migrating would deep-copy all of them first.
+        payload = read_json(path)
+        results = payload.get("results")
+        if not isinstance(results, list):
+            results = []
+        # Statuses repeat a handful of values, so only the distinct ones are normalized.
+        statuses = Counter([r.get("status", "") for r in results])
+        ok_count = sum(n for value, n in statuses.items() if str(value).lower() == "ok")
+        return {
+            "manifest_id": path.stem,
+            "filename": path.name,
+            "created_at": payload.get("created_at"),
+            "status": payload.get("status"),
+            "rows": len(results),
+            "ok": ok_count,
+            "failed": len(results) - ok_count,
+        }
+
     def list_ingest_manifests(
         self,
         limit: int = 50,
@@ -130,43 +205,31 @@ class ReportReader:
         from_at: Optional[str] = None,
         to_at: Optional[str] = None,
     ) -> dict[str, Any]:
-        files = sorted(
-            [p for p in self.ingest_root.glob("manifest_*.json") if p.is_file()],
-            key=lambda p: p.stat().st_mtime,
-            reverse=True,
-        )
+        if self._index_ready():
+            return self.index.list_ingest_manifests(
+                limit=limit, offset=offset, status=status, from_at=from_at, to_at=to_at
+            )
+
+        files = self._report_files(self.ingest_root, "manifest_")
+        if not (status or from_at or to_at):
+            items = [self._manifest_item(path) for path in files[offset : offset + limit]]
+            return {"total": len(files), "limit": limit, "offset": offset, "items": items}
 
         from_dt = self._parse_datetime(from_at)
         to_dt = self._parse_datetime(to_at)
         items: list[dict[str, Any]] = []
         for path in files:
-            payload = self._load_json(path)
-            manifest_status = str(payload.get("status", "")).lower()
-            if status and manifest_status != status.lower():
+            item = self._manifest_item(path)
+            if status and str(item["status"] or "").lower() != status.lower():
                 continue
 
-            created_at = payload.get("created_at")
-            created_dt = self._parse_datetime(created_at)
+            created_dt = self._parse_datetime(item["created_at"])
             if from_dt and (created_dt is None or created_dt < from_dt):
                 continue
             if to_dt and (created_dt is None or created_dt > to_dt):
                 continue
 
-            results = payload.get("results", [])
-            ok_count = sum(1 for r in results if str(r.get("status", "")).lower() == "ok")
-            fail_count = len(results) - ok_count
-
-            items.append(
-                {
-                    "manifest_id": path.stem,
-                    "filename": path.name,
-                    "created_at": created_at,
-                    "status": payload.get("status"),
-                    "rows": len(results),
-                    "ok": ok_count,
-                    "failed": fail_count,
-                }
-            )
+            items.append(item)
 
         total = len(items)
         page = items[offset : offset + limit]
@@ -180,5 +243,5 @@ class ReportReader:
         path = next((p for p in candidates if p.exists()), None)
         if path is None:
             raise FileNotFoundError(f"manifest not found: {manifest_id}")
-        payload = self._load_json(path)
+        payload = self._load_detail(path)
         return {"manifest_id": path.stem, "payload": payload}
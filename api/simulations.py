@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from api.json_io import write_json
 from bots import get_strategy, list_strategies
 from cbot_farm.backtest import run_real_backtest
 from cbot_farm.optimization import evaluate_gates
@@ -28,7 +28,7 @@ class SimulationService:
     def options(self) -> Dict[str, Any]:
         markets = self.universe_cfg.get("markets", {})
         return {
-            "strategies": list_strategies(),
+            "strategies": dict(list_strategies()),
             "markets": markets,
             "defaults": {
                 "strategy_id": "ema_cross_atr",
@@ -95,8 +95,7 @@ class SimulationService:
         }
 
         out_path = self.reports_root / f"{run_stem}.json"
-        with out_path.open("w", encoding="utf-8") as fh:
-            json.dump(out_payload, fh, indent=2)
+        write_json(out_path, out_payload)
 
         return {
             "run_id": run_stem,
@@ -82,7 +82,7 @@ class StrategyIntakeService:
 
     def options(self) -> Dict[str, Any]:
         return {
-            "strategies": list_strategies(),
+            "strategies": dict(list_strategies()),
             "markets": self.universe_cfg.get("markets", {}),
             "defaults": {
                 "linked_strategy_id": "",
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
-import json
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
 
+from api.fs_scan import dir_file_stats, iter_newest
+from api.json_io import read_json, read_json_mapped, write_json
 from bots import list_strategies
-from cbot_farm.report_schema import migrate_report_payload
 
-STATES = [
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+# Dashboards poll the board every few seconds; within this window an unchanged storage file and
+# reports directory serve the previous response without rescanning.
+_BOARD_TTL_S = 1.5
+
+STATES = (
     "draft",
     "research",
     "backtest",
@@ -16,70 +23,127 @@ STATES = [
     "paper",
     "approved",
     "archived",
-]
+)
 
-ALLOWED_TRANSITIONS: Dict[str, List[str]] = {
-    "draft": ["research", "archived"],
-    "research": ["backtest", "archived"],
-    "backtest": ["research", "candidate", "archived"],
-    "candidate": ["backtest", "paper", "archived"],
-    "paper": ["candidate", "approved", "archived"],
-    "approved": ["archived"],
-    "archived": ["research"],
-}
+# Read-only and shared by every board response; tuples keep the targets in display order.
+ALLOWED_TRANSITIONS: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+    {
+        "draft": ("research", "archived"),
+        "research": ("backtest", "archived"),
+        "backtest": ("research", "candidate", "archived"),
+        "candidate": ("backtest", "paper", "archived"),
+        "paper": ("candidate", "approved", "archived"),
+        "approved": ("archived",),
+        "archived": ("research",),
+    }
+)
 
 
 def _now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+# (strategy_id, latest-run fields) of one report, or None when it cannot be read.
+RunSummary = Optional[Tuple[str, Dict[str, Any]]]
+
+
+def _run_summary(path: Path) -> RunSummary:
+    # Reads the raw JSON and resolves the legacy fields itself, like ReportReader._run_item, rather
+    # than deep-copying whole trade logs through the schema migration.
+    try:
+        payload = read_json_mapped(path)
+        strategy_id = payload.get("strategy_id")
+        strategy = payload.get("strategy")
+        if strategy_id is None and isinstance(strategy, dict):
+            strategy_id = strategy.get("strategy_id")
+        metrics = payload.get("metrics") or (payload.get("backtest") or _EMPTY).get("metrics", {})
+    except Exception:
+        return None
+    return str(strategy_id or ""), {
+        "run_id": path.stem,
+        "created_at": payload.get("created_at") or payload.get("run_at"),
+        "metrics": metrics,
+    }
+
+
 class StrategyWorkflowService:
     def __init__(self, storage_path: Path, reports_root: Path) -> None:
         self.storage_path = storage_path
         self.reports_root = reports_root
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        # (mtime_ns, size, payload) of the board file as last read or written by this process.
+        self._cached: Optional[Tuple[int, int, Dict[str, Any]]] = None
+        # (monotonic time, _board_key(), response) of the last board built.
+        self._board_cache: Optional[Tuple[float, tuple, Dict[str, Any]]] = None
+        # Report name -> (mtime_ns, size, summary). Board refreshes only parse reports written since
+        # the last scan; entries for reports that left the directory are dropped, so the cache never
+        # outgrows the directory and a full scan never evicts what it just filled.
+        self._run_summaries: Dict[str, Tuple[int, int, RunSummary]] = {}
 
     def _load(self) -> Dict[str, Any]:
-        if not self.storage_path.exists():
+        try:
+            st = self.storage_path.stat()
+        except FileNotFoundError:
             return {
                 "schema_version": 1,
                 "updated_at": _now(),
                 "strategies": [],
             }
-        with self.storage_path.open("r", encoding="utf-8") as fh:
-            return json.load(fh)
+        if self._cached is not None and self._cached[:2] == (st.st_mtime_ns, st.st_size):
+            return self._cached[2]
+        payload = read_json(self.storage_path)
+        self._cached = (st.st_mtime_ns, st.st_size, payload)
+        return payload
 
-    def _save(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        payload["updated_at"] = _now()
-        with self.storage_path.open("w", encoding="utf-8") as fh:
-            json.dump(payload, fh, indent=2)
+    def _save(self, payload: Dict[str, Any], now: Optional[str] = None) -> Dict[str, Any]:
+        payload["updated_at"] = now or _now()
+        self._board_cache = None
+        try:
+            # Compact: the file is machine-read and rewritten on every transition, and history only grows.
+            write_json(self.storage_path, payload, indent=False)
+        except Exception:
+            # The payload may have been edited in place; never serve it as the file's content.
+            self._cached = None
+            raise
+        st = self.storage_path.stat()
+        self._cached = (st.st_mtime_ns, st.st_size, payload)
         return payload
 
-    def _latest_run_for(self, strategy_id: str) -> Optional[Dict[str, Any]]:
-        files = sorted(
-            [p for p in self.reports_root.glob("run_*.json") if p.is_file()],
-            key=lambda p: p.stat().st_mtime,
-            reverse=True,
-        )
-        for path in files:
-            try:
-                with path.open("r", encoding="utf-8") as fh:
-                    payload = migrate_report_payload(json.load(fh), path=path)
-            except Exception:
-                continue
-            if str(payload.get("strategy_id") or "") != strategy_id:
+    def _latest_runs_by_strategy(self, strategy_ids: Set[str]) -> Dict[str, Dict[str, Any]]:
+        # One newest-first pass over the reports serves every strategy on the board; it stops as
+        # soon as each requested strategy has its latest run.
+        try:
+            files = dir_file_stats(self.reports_root, "run_", ".json", ordered=False)
+        except FileNotFoundError:
+            return {}
+        summaries = self._run_summaries
+        if len(summaries) > len(files):
+            present = {name for name, _, _ in files}
+            self._run_summaries = summaries = {name: entry for name, entry in summaries.items() if name in present}
+
+        latest: Dict[str, Dict[str, Any]] = {}
+        pending = set(strategy_ids)
+        for name, mtime_ns, size in iter_newest(files):
+            if not pending:
+                break
+            cached = summaries.get(name)
+            if cached is not None and cached[0] == mtime_ns and cached[1] == size:
+                summary = cached[2]
+            else:
+                summary = _run_summary(self.reports_root / name)
+                summaries[name] = (mtime_ns, size, summary)
+            if summary is None or summary[0] not in pending:
                 continue
-            return {
-                "run_id": path.stem,
-                "created_at": payload.get("created_at") or payload.get("run_at"),
-                "metrics": payload.get("metrics") or payload.get("backtest", {}).get("metrics", {}),
-            }
-        return None
+            pending.discard(summary[0])
+            latest[summary[0]] = dict(summary[1])
+        return latest
 
     def init_from_registry(self) -> Dict[str, Any]:
         payload = self._load()
         existing = {item.get("strategy_id"): item for item in payload.get("strategies", []) if isinstance(item, dict)}
 
+        # One timestamp per operation keeps the created entries and the board's updated_at consistent.
+        now = _now()
         merged: List[Dict[str, Any]] = []
         for strategy_id, display_name in list_strategies().items():
             current = existing.get(strategy_id)
@@ -91,10 +155,10 @@ class StrategyWorkflowService:
                     "strategy_id": strategy_id,
                     "display_name": display_name,
                     "state": "draft",
-                    "updated_at": _now(),
+                    "updated_at": now,
                     "history": [
                         {
-                            "at": _now(),
+                            "at": now,
                             "event": "created",
                             "from_state": None,
                             "to_state": "draft",
@@ -104,18 +168,41 @@ class StrategyWorkflowService:
                 }
             )
 
+        if merged == payload.get("strategies"):
+            # Boards are read far more often than the registry changes; skip the rewrite.
+            return payload
         payload["strategies"] = merged
-        return self._save(payload)
+        return self._save(payload, now=now)
+
+    def _board_key(self) -> tuple:
+        # Reports are written by atomic rename, so a new or replaced report bumps the directory
+        # mtime; in-place edits are picked up once the TTL expires.
+        key = []
+        for path in (self.storage_path, self.reports_root):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                key.append(None)
+                continue
+            key.append((st.st_mtime_ns, st.st_size))
+        return tuple(key)
 
     def get_board(self) -> Dict[str, Any]:
+        started = time.monotonic()
+        key = self._board_key()
+        cached = self._board_cache
+        if cached is not None and cached[1] == key and started - cached[0] < _BOARD_TTL_S:
+            return cached[2]
+
         payload = self.init_from_registry()
 
+        strategies = [item for item in payload.get("strategies", []) if isinstance(item, dict)]
+        latest_runs = self._latest_runs_by_strategy({str(item.get("strategy_id") or "") for item in strategies})
+
         items: List[Dict[str, Any]] = []
-        for item in payload.get("strategies", []):
-            if not isinstance(item, dict):
-                continue
+        for item in strategies:
             strategy_id = str(item.get("strategy_id") or "")
-            latest = self._latest_run_for(strategy_id)
+            latest = latest_runs.get(strategy_id)
             state = str(item.get("state") or "draft")
             items.append(
                 {
@@ -123,7 +210,7 @@ class StrategyWorkflowService:
                     "display_name": item.get("display_name") or strategy_id,
                     "state": state,
                     "updated_at": item.get("updated_at"),
-                    "allowed_transitions": ALLOWED_TRANSITIONS.get(state, []),
+                    "allowed_transitions": ALLOWED_TRANSITIONS.get(state, ()),
                     "last_run": latest,
                     "history_size": len(item.get("history", [])) if isinstance(item.get("history"), list) else 0,
                 }
@@ -135,12 +222,14 @@ class StrategyWorkflowService:
             if s in state_counts:
                 state_counts[s] += 1
 
-        return {
+        board = {
             "states": STATES,
             "counts": state_counts,
             "items": items,
             "updated_at": payload.get("updated_at"),
         }
+        self._board_cache = (started, key, board)
+        return board
 
     def transition(self, strategy_id: str, to_state: str, note: str = "") -> Dict[str, Any]:
         if to_state not in STATES:
@@ -158,12 +247,13 @@ class StrategyWorkflowService:
             if to_state == from_state:
                 return item
 
-            allowed = ALLOWED_TRANSITIONS.get(from_state, [])
+            allowed = ALLOWED_TRANSITIONS.get(from_state, ())
             if to_state not in allowed:
                 raise ValueError(f"transition not allowed: {from_state} -> {to_state}")
 
+            now = _now()
             event = {
-                "at": _now(),
+                "at": now,
                 "event": "transition",
                 "from_state": from_state,
                 "to_state": to_state,
@@ -171,11 +261,11 @@ class StrategyWorkflowService:
             }
 
             item["state"] = to_state
-            item["updated_at"] = _now()
+            item["updated_at"] = now
             history = item.setdefault("history", [])
             if isinstance(history, list):
                 history.append(event)
-            self._save(payload)
+            self._save(payload, now=now)
             return item
 
         raise FileNotFoundError(f"strategy not found: {strategy_id}")
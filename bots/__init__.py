@@ -1,4 +1,5 @@
-from typing import Dict
+from types import MappingProxyType
+from typing import Mapping
 
 from bots.base import BaseBotStrategy
 from bots.ema_cross_atr import EmaCrossAtrBot
@@ -21,5 +22,9 @@ def get_strategy(strategy_id: str) -> BaseBotStrategy:
     return bot_cls()
 
 
-def list_strategies() -> Dict[str, str]:
-    return {sid: cls.display_name for sid, cls in REGISTRY.items()}
+# The registry is fixed at import time, so the names are built once and shared read-only.
+_STRATEGY_NAMES: Mapping[str, str] = MappingProxyType({sid: cls.display_name for sid, cls in REGISTRY.items()})
+
+
+def list_strategies() -> Mapping[str, str]:
+    return _STRATEGY_NAMES
@@ -27,6 +27,14 @@ class BaseBotStrategy(ABC):
     ) -> int:
         """Return 1 (long), -1 (short), or 0 (no entry)."""
 
+    def signal_series(self, indicators: dict) -> Optional[List[int]]:
+        """Optionally return every bar's entry_signal, precomputed in prepare_indicators.
+
+        When provided, the backtest reads entries from this list and flips positions whose sign
+        is opposite to the bar's signal, without calling entry_signal/should_flip per bar.
+        """
+        return None
+
     @abstractmethod
     def should_flip(
         self,
@@ -1,41 +1,163 @@
-from typing import Dict, List, Optional
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 from bots.base import BaseBotStrategy
 from cbot_farm.indicators import atr_series, ema_series, rsi_series
 
 
+# Keep core structure stable and vary only reinforcement filters.
+_RSI_STEPS = (45, 50, 55, 60)
+_VOL_STEPS = (1.2, 1.4, 1.6, 1.8, 2.0)
+# Samples repeat once both step tables wrap around together.
+_SAMPLE_CYCLE = len(_RSI_STEPS) * len(_VOL_STEPS)
+
+
+@lru_cache(maxsize=None)
+def _sampled_params(phase: int) -> Mapping[str, Any]:
+    return MappingProxyType(
+        {
+            "ema_fast": 20,
+            "ema_slow": 50,
+            "atr_period": 14,
+            "atr_mult_stop": 1.5,
+            "atr_mult_take": 2.0,
+            "rsi_period": 14,
+            "rsi_gate": _RSI_STEPS[phase % len(_RSI_STEPS)],
+            "atr_vol_window": 50,
+            "atr_vol_ratio_max": _VOL_STEPS[phase % len(_VOL_STEPS)],
+        }
+    )
+
+
 def _sma_optional(values: List[Optional[float]], period: int) -> List[Optional[float]]:
     out: List[Optional[float]] = [None] * len(values)
     if period <= 1:
         return [float(v) if v is not None else None for v in values]
 
-    for i in range(period - 1, len(values)):
-        window = values[i - period + 1 : i + 1]
-        if any(v is None for v in window):
+    # Rolling sum over the window plus a count of the Nones inside it. The sum is recomputed from
+    # the window once per period, so rounding drift never spans more than one window.
+    running = 0.0
+    none_count = 0
+    for i, value in enumerate(values):
+        if value is None:
+            none_count += 1
+        else:
+            running += value
+        start = i - period + 1
+        if start > 0:
+            leaving = values[start - 1]
+            if leaving is None:
+                none_count -= 1
+            else:
+                running -= leaving
+        if start < 0 or none_count:
             continue
-        out[i] = float(sum(window)) / float(period)
+        if start % period == 0:
+            running = float(sum(values[start : i + 1]))
+        out[i] = running / float(period)
     return out
 
 
+def _signal_at(i: int, indicators: dict) -> int:
+    if i < 1:
+        return 0
+    prev_fast, prev_slow = indicators["ema_fast"][i - 1], indicators["ema_slow"][i - 1]
+    curr_fast, curr_slow = indicators["ema_fast"][i], indicators["ema_slow"][i]
+    rsi_prev = indicators["rsi"][i - 1]
+    atr_value = indicators["atr"][i - 1]
+    atr_mean = indicators["atr_avg"][i - 1]
+
+    if (
+        prev_fast is None
+        or prev_slow is None
+        or curr_fast is None
+        or curr_slow is None
+        or rsi_prev is None
+    ):
+        return 0
+
+    # Volatility filter: the previous bar's ATR must stay within ratio_limit of its average.
+    ratio_limit = float(indicators["entry_filters"]["atr_vol_ratio_max"])
+    if atr_value is None or atr_mean is None or atr_mean <= 0:
+        return 0
+    if float(atr_value) > float(atr_mean) * ratio_limit:
+        return 0
+
+    rsi_gate = int(indicators["entry_filters"]["rsi_gate"])
+    if prev_fast <= prev_slow and curr_fast > curr_slow:
+        return 1 if float(rsi_prev) >= float(rsi_gate) else 0
+    if prev_fast >= prev_slow and curr_fast < curr_slow:
+        short_gate = 100.0 - float(rsi_gate)
+        return -1 if float(rsi_prev) <= short_gate else 0
+    return 0
+
+
+def _first_valid(series: List[Optional[float]]) -> int:
+    for i, value in enumerate(series):
+        if value is not None:
+            return i
+    return len(series)
+
+
+def _signal_kernel(
+    ema_fast: List[Optional[float]],
+    ema_slow: List[Optional[float]],
+    rsi: List[Optional[float]],
+    atr: List[Optional[float]],
+    atr_avg: List[Optional[float]],
+    rsi_gate: int,
+    atr_vol_ratio_max: float,
+) -> List[int]:
+    # Same rule as _signal_at for every bar in one pass. The indicator helpers only emit None
+    # during warm-up, so the loop starts at the first bar whose inputs are all set and the per-bar
+    # None checks disappear.
+    long_gate = float(rsi_gate)
+    short_gate = 100.0 - long_gate
+    ratio_limit = float(atr_vol_ratio_max)
+    signals = [0] * len(ema_fast)
+    prev = max(_first_valid(series) for series in (ema_fast, ema_slow, rsi, atr, atr_avg))
+    rows = zip(
+        islice(ema_fast, prev, None),
+        islice(ema_fast, prev + 1, None),
+        islice(ema_slow, prev, None),
+        islice(ema_slow, prev + 1, None),
+        islice(rsi, prev, None),
+        islice(atr, prev, None),
+        islice(atr_avg, prev, None),
+    )
+    for i, (prev_fast, curr_fast, prev_slow, curr_slow, rsi_prev, atr_value, atr_mean) in enumerate(rows, prev + 1):
+        if atr_mean <= 0 or atr_value > atr_mean * ratio_limit:
+            continue
+        if prev_fast <= prev_slow and curr_fast > curr_slow:
+            if rsi_prev >= long_gate:
+                signals[i] = 1
+        elif prev_fast >= prev_slow and curr_fast < curr_slow:
+            if rsi_prev <= short_gate:
+                signals[i] = -1
+    return signals
+
+
 class EmaCrossAtrBot(BaseBotStrategy):
     strategy_id = "ema_cross_atr"
     display_name = "EMA Cross ATR Bot"
 
+    def __init__(self) -> None:
+        # Optimizer iterations rerun prepare_indicators on the same bars and mostly vary the entry
+        # filters, so series are kept per (indicator, periods) until the price data changes.
+        self._series_prices: Optional[Tuple[List[float], List[float], List[float]]] = None
+        self._series_cache: Dict[tuple, List[Optional[float]]] = {}
+
+    def _series(self, key: tuple, compute: Callable[[], List[Optional[float]]]) -> List[Optional[float]]:
+        series = self._series_cache.get(key)
+        if series is None:
+            series = self._series_cache[key] = compute()
+        return series
+
     def sample_params(self, iteration: int) -> dict:
-        # Keep core structure stable and vary only reinforcement filters.
-        rsi_steps = [45, 50, 55, 60]
-        vol_steps = [1.2, 1.4, 1.6, 1.8, 2.0]
-        return {
-            "ema_fast": 20,
-            "ema_slow": 50,
-            "atr_period": 14,
-            "atr_mult_stop": 1.5,
-            "atr_mult_take": 2.0,
-            "rsi_period": 14,
-            "rsi_gate": rsi_steps[(iteration - 1) % len(rsi_steps)],
-            "atr_vol_window": 50,
-            "atr_vol_ratio_max": vol_steps[(iteration - 1) % len(vol_steps)],
-        }
+        # Callers merge overrides into the result, so each one gets its own copy.
+        return dict(_sampled_params((iteration - 1) % _SAMPLE_CYCLE))
 
     def normalize_params(self, params: dict, bars_count: int) -> dict:
         max_slow = max(6, min(int(params.get("ema_slow", 50)), max(6, bars_count // 2)))
@@ -64,58 +186,53 @@ class EmaCrossAtrBot(BaseBotStrategy):
         highs = [bar["high"] for bar in bars]
         lows = [bar["low"] for bar in bars]
 
-        atr = atr_series(highs, lows, closes, period=int(params["atr_period"]))
-        return {
-            "ema_fast": ema_series(closes, int(params["ema_fast"])),
-            "ema_slow": ema_series(closes, int(params["ema_slow"])),
+        # The column lists are built here and never handed out, so they double as the cache key
+        # without tuple copies; the comparison stops at the first column that differs.
+        prices = (closes, highs, lows)
+        if prices != self._series_prices:
+            self._series_prices = prices
+            self._series_cache.clear()
+
+        # Cached series are shared between runs; the backtest loop only reads them.
+        ema_fast = int(params["ema_fast"])
+        ema_slow = int(params["ema_slow"])
+        atr_period = int(params["atr_period"])
+        rsi_period = int(params["rsi_period"])
+        atr_vol_window = int(params["atr_vol_window"])
+        atr = self._series(("atr", atr_period), lambda: atr_series(highs, lows, closes, period=atr_period))
+        indicators = {
+            "ema_fast": self._series(("ema", ema_fast), lambda: ema_series(closes, ema_fast)),
+            "ema_slow": self._series(("ema", ema_slow), lambda: ema_series(closes, ema_slow)),
             "atr": atr,
-            "rsi": rsi_series(closes, period=int(params["rsi_period"])),
-            "atr_avg": _sma_optional(atr, int(params["atr_vol_window"])),
+            "rsi": self._series(("rsi", rsi_period), lambda: rsi_series(closes, period=rsi_period)),
+            "atr_avg": self._series(
+                ("atr_avg", atr_period, atr_vol_window), lambda: _sma_optional(atr, atr_vol_window)
+            ),
             "entry_filters": {
                 "rsi_gate": int(params["rsi_gate"]),
                 "atr_vol_ratio_max": float(params["atr_vol_ratio_max"]),
             },
         }
+        # Each bar's signal is evaluated once here; should_flip and entry_signal just look it up.
+        indicators["signals"] = _signal_kernel(
+            indicators["ema_fast"],
+            indicators["ema_slow"],
+            indicators["rsi"],
+            atr,
+            indicators["atr_avg"],
+            rsi_gate=int(params["rsi_gate"]),
+            atr_vol_ratio_max=float(params["atr_vol_ratio_max"]),
+        )
+        return indicators
 
-    def _volatility_allowed(self, i: int, indicators: dict) -> bool:
-        atr = indicators["atr"]
-        atr_avg = indicators["atr_avg"]
-        ratio_limit = float(indicators["entry_filters"]["atr_vol_ratio_max"])
-
-        atr_value = atr[i - 1] if i - 1 >= 0 else None
-        atr_mean = atr_avg[i - 1] if i - 1 >= 0 else None
-        if atr_value is None or atr_mean is None or atr_mean <= 0:
-            return False
-        return float(atr_value) <= float(atr_mean) * ratio_limit
+    def signal_series(self, indicators: dict) -> Optional[List[int]]:
+        return indicators.get("signals")
 
     def entry_signal(self, i: int, bars: List[Dict[str, float]], indicators: dict) -> int:
-        fast = indicators["ema_fast"]
-        slow = indicators["ema_slow"]
-        rsi = indicators["rsi"]
-        rsi_gate = int(indicators["entry_filters"]["rsi_gate"])
-
-        prev_fast, prev_slow = fast[i - 1], slow[i - 1]
-        curr_fast, curr_slow = fast[i], slow[i]
-        rsi_prev = rsi[i - 1] if i - 1 >= 0 else None
-
-        if (
-            prev_fast is None
-            or prev_slow is None
-            or curr_fast is None
-            or curr_slow is None
-            or rsi_prev is None
-        ):
-            return 0
-
-        if not self._volatility_allowed(i=i, indicators=indicators):
-            return 0
-
-        if prev_fast <= prev_slow and curr_fast > curr_slow:
-            return 1 if float(rsi_prev) >= float(rsi_gate) else 0
-        if prev_fast >= prev_slow and curr_fast < curr_slow:
-            short_gate = 100.0 - float(rsi_gate)
-            return -1 if float(rsi_prev) <= short_gate else 0
-        return 0
+        signals = indicators.get("signals")
+        if signals is not None:
+            return signals[i]
+        return _signal_at(i, indicators)
 
     def should_flip(
         self,
@@ -124,8 +241,8 @@ class EmaCrossAtrBot(BaseBotStrategy):
         bars: List[Dict[str, float]],
         indicators: dict,
     ) -> bool:
-        signal = self.entry_signal(i, bars, indicators)
-        return (position == 1 and signal == -1) or (position == -1 and signal == 1)
+        # Positions and signals are -1/0/1, so a flip is exactly a negative product.
+        return position * self.entry_signal(i, bars, indicators) < 0
 
     def risk_levels(
         self,
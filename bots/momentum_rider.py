@@ -1,3 +1,4 @@
+from itertools import islice
 from typing import Dict, List, Optional
 
 from bots.base import BaseBotStrategy
@@ -17,6 +18,32 @@ def _sma_optional(values: List[Optional[float]], period: int) -> List[Optional[f
     return out
 
 
+def _macd_cross_mask(
+    macd_line: List[Optional[float]],
+    macd_signal: List[Optional[float]],
+    macd_hist: List[Optional[float]],
+) -> List[int]:
+    # 1 where the MACD crosses above its signal with a positive line and histogram, -1 for the
+    # mirrored bearish cross, 0 elsewhere. Computed once per run so entry_signal can dismiss the
+    # bars without a cross, which is nearly all of them, with one lookup.
+    mask = [0] * len(macd_line)
+    rows = zip(
+        macd_line,
+        macd_signal,
+        islice(macd_line, 1, None),
+        islice(macd_signal, 1, None),
+        islice(macd_hist, 1, None),
+    )
+    for i, (macd_prev, signal_prev, macd_curr, signal_curr, hist_curr) in enumerate(rows, 1):
+        if macd_prev is None or signal_prev is None or macd_curr is None or signal_curr is None or hist_curr is None:
+            continue
+        if macd_prev <= signal_prev and macd_curr > signal_curr and hist_curr > 0 and macd_curr > 0:
+            mask[i] = 1
+        elif macd_prev >= signal_prev and macd_curr < signal_curr and hist_curr < 0 and macd_curr < 0:
+            mask[i] = -1
+    return mask
+
+
 class MomentumRiderBot(BaseBotStrategy):
     strategy_id = "momentum_rider"
     display_name = "Momentum Rider"
@@ -89,6 +116,7 @@ class MomentumRiderBot(BaseBotStrategy):
             "macd_line": macd_line,
             "macd_signal": macd_signal,
             "macd_hist": macd_hist,
+            "macd_cross": _macd_cross_mask(macd_line, macd_signal, macd_hist),
             "rsi": rsi_series(closes, int(params["rsi_period"])),
             "adx": adx_series(highs, lows, closes, int(params["adx_period"])),
             "atr": atr,
@@ -114,6 +142,10 @@ class MomentumRiderBot(BaseBotStrategy):
     def entry_signal(self, i: int, bars: List[Dict[str, float]], indicators: dict) -> int:
         if i < 1:
             return 0
+        # Entries need a MACD cross on this bar; without one no other filter can produce a signal.
+        macd_cross = indicators.get("macd_cross")
+        if macd_cross is not None and not macd_cross[i]:
+            return 0
 
         fast = indicators["ema_fast"]
         slow = indicators["ema_slow"]
@@ -16,7 +16,7 @@
 #    - RSI: Confirms momentum alignment
 
 from random import random, uniform
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from bots.base import BaseBotStrategy
 from cbot_farm.indicators import adx_series, atr_series, ema_series, rsi_series, supertrend_series
@@ -26,6 +26,19 @@ class SuperTrendRsiBot(BaseBotStrategy):
     strategy_id = "supertrend_rsi"
     display_name = "SuperTrend + RSI Momentum"
 
+    def __init__(self) -> None:
+        # A sweep mostly moves st_mult and the ATR multipliers; RSI/ADX/EMA/ATR depend only on
+        # their periods and the prices, so they are computed once per dataset and period. SuperTrend
+        # is left out: random (period, multiplier) draws almost never repeat.
+        self._series_prices: Optional[Tuple[List[float], List[float], List[float]]] = None
+        self._series_cache: Dict[tuple, Any] = {}
+
+    def _series(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        series = self._series_cache.get(key)
+        if series is None:
+            series = self._series_cache[key] = compute()
+        return series
+
     def sample_params(self, iteration: int) -> dict:
         # Generate parameter samples for optimization iterations
         # Varies SuperTrend sensitivity, filters, and risk levels
@@ -62,20 +75,27 @@ class SuperTrendRsiBot(BaseBotStrategy):
         closes = [bar["close"] for bar in bars]
         highs = [bar["high"] for bar in bars]
         lows = [bar["low"] for bar in bars]
-        
-        st_up, st_down = supertrend_series(
-            highs, lows, closes, 
-            period=int(params["st_period"]),
-            multiplier=float(params["st_mult"])
-        )
+
+        # A new dataset (or a rewritten one) shows up as different price columns.
+        prices = (closes, highs, lows)
+        if prices != self._series_prices:
+            self._series_prices = prices
+            self._series_cache.clear()
+
+        st_period = int(params["st_period"])
+        st_mult = float(params["st_mult"])
+        rsi_period = int(params["rsi_period"])
+        ema_period = int(params["ema_period"])
+        atr_period = int(params["atr_period"])
+        st_up, st_down = supertrend_series(highs, lows, closes, period=st_period, multiplier=st_mult)
         
         return {
             "st_up": st_up,
             "st_down": st_down,
-            "rsi": rsi_series(closes, period=int(params["rsi_period"])),
-            "adx": adx_series(highs, lows, closes, period=14),
-            "ema": ema_series(closes, period=int(params["ema_period"])),
-            "atr": atr_series(highs, lows, closes, period=int(params["atr_period"])),
+            "rsi": self._series(("rsi", rsi_period), lambda: rsi_series(closes, period=rsi_period)),
+            "adx": self._series(("adx", 14), lambda: adx_series(highs, lows, closes, period=14)),
+            "ema": self._series(("ema", ema_period), lambda: ema_series(closes, period=ema_period)),
+            "atr": self._series(("atr", atr_period), lambda: atr_series(highs, lows, closes, period=atr_period)),
             # Store min_adx as metadata for entry_signal (params not passed there)
             "_min_adx": int(params["min_adx"]),
         }
@@ -1,8 +1,11 @@
 import csv
 import math
+import os
+from bisect import bisect_right
+from itertools import accumulate, islice
+from operator import mul
 from pathlib import Path
-from statistics import mean, pstdev
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from bots.base import BaseBotStrategy
 from .config import ROOT
@@ -15,6 +18,56 @@ def _split_csv_filter(raw: Optional[List[str]]) -> Optional[List[str]]:
     return [item.lower() for item in raw]
 
 
+# data_root -> (mtime_ns of every directory walked, (path, market, symbol, timeframe) per csv).
+_CSV_TREES: Dict[str, Tuple[Tuple[Tuple[str, int], ...], Tuple[Tuple[Path, str, str, str], ...]]] = {}
+
+
+def _walk_csv_tree(
+    root: str,
+    dirs: List[Tuple[str, int]],
+    files: List[Tuple[Path, str, str, str]],
+) -> None:
+    # Same order as Path.rglob("*.csv"): a directory's own files, then its subdirectories depth-first.
+    try:
+        dirs.append((root, os.stat(root).st_mtime_ns))
+        with os.scandir(root) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.endswith(".csv"):
+            path = Path(entry.path)
+            parts = [p.lower() for p in path.parts]
+            # Expected tail: .../<market>/<symbol>/<timeframe>/download/<file>.csv
+            if len(parts) >= 6:
+                files.append((path, parts[-5], parts[-4], parts[-3]))
+    for entry in entries:
+        try:
+            if entry.is_dir() and not entry.is_symlink():
+                _walk_csv_tree(entry.path, dirs, files)
+        except OSError:
+            continue
+
+
+def _csv_tree(data_root: Path) -> Tuple[Tuple[Path, str, str, str], ...]:
+    # Adding, removing or renaming an entry bumps its directory's mtime, so one stat per directory
+    # tells whether the cached listing is still complete without listing anything again.
+    key = str(data_root)
+    cached = _CSV_TREES.get(key)
+    if cached is not None:
+        try:
+            if all(os.stat(path).st_mtime_ns == mtime_ns for path, mtime_ns in cached[0]):
+                return cached[1]
+        except OSError:
+            pass
+
+    dirs: List[Tuple[str, int]] = []
+    files: List[Tuple[Path, str, str, str]] = []
+    _walk_csv_tree(key, dirs, files)
+    _CSV_TREES[key] = (tuple(dirs), tuple(files))
+    return _CSV_TREES[key][1]
+
+
 def _find_candidate_files(
     data_root: Path,
     markets_filter: Optional[List[str]],
@@ -29,15 +82,7 @@ def _find_candidate_files(
     if not data_root.exists():
         return files
 
-    for csv_path in data_root.rglob("*.csv"):
-        parts = [p.lower() for p in csv_path.parts]
-        # Expected tail: .../<market>/<symbol>/<timeframe>/download/<file>.csv
-        if len(parts) < 6:
-            continue
-        market = parts[-5]
-        symbol = parts[-4]
-        timeframe = parts[-3]
-
+    for csv_path, market, symbol, timeframe in _csv_tree(data_root):
         if markets and market not in markets:
             continue
         if symbols and symbol not in symbols:
@@ -46,28 +91,53 @@ def _find_candidate_files(
             continue
         files.append(csv_path)
 
+    # Files can be rewritten in place without touching their directory, so the order is always fresh.
     files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
     return files
 
 
-def _load_ohlc_bars(csv_path: Path) -> List[Dict[str, float]]:
-    bars: List[Dict[str, float]] = []
-    with csv_path.open("r", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
+_OHLC_FIELDS = ("timestamp", "open", "high", "low", "close")
+
+
+def _grow(equity: float, bar_ret: float) -> float:
+    return equity * (1.0 + bar_ret)
+
+
+def _load_ohlc_columns(csv_path: Path) -> Dict[str, List[float]]:
+    # Column per field (SoA): the backtest loop walks these directly. A row only lands in the
+    # columns when all of its fields parse.
+    columns: Dict[str, List[float]] = {field: [] for field in _OHLC_FIELDS}
+    add_ts, add_open, add_high, add_low, add_close = (columns[field].append for field in _OHLC_FIELDS)
+    with csv_path.open("r", encoding="utf-8", newline="") as fh:
+        reader = csv.reader(fh)
+        # Positional access instead of a dict per row; like DictReader, the last duplicate header wins.
+        header = {name: idx for idx, name in enumerate(next(reader, []))}
+        if any(field not in header for field in _OHLC_FIELDS):
+            return columns
+        i_ts, i_open, i_high, i_low, i_close = (header[field] for field in _OHLC_FIELDS)
         for row in reader:
             try:
-                bars.append(
-                    {
-                        "timestamp": float(row["timestamp"]),
-                        "open": float(row["open"]),
-                        "high": float(row["high"]),
-                        "low": float(row["low"]),
-                        "close": float(row["close"]),
-                    }
-                )
-            except (KeyError, TypeError, ValueError):
+                ts = float(row[i_ts])
+                open_ = float(row[i_open])
+                high = float(row[i_high])
+                low = float(row[i_low])
+                close = float(row[i_close])
+            except (IndexError, ValueError):
                 continue
-    return bars
+            add_ts(ts)
+            add_open(open_)
+            add_high(high)
+            add_low(low)
+            add_close(close)
+    return columns
+
+
+def _bars_from_columns(columns: Dict[str, List[float]]) -> List[Dict[str, float]]:
+    # Strategies still take one dict per bar.
+    return [
+        {"timestamp": ts, "open": open_, "high": high, "low": low, "close": close}
+        for ts, open_, high, low, close in zip(*(columns[field] for field in _OHLC_FIELDS))
+    ]
 
 
 def _bars_per_year(timeframe: str) -> int:
@@ -84,17 +154,43 @@ def _bars_per_year(timeframe: str) -> int:
 
 
 def _max_drawdown_pct(equity_curve: List[float]) -> float:
-    peak = equity_curve[0]
+    # The deepest drawdown under a peak sits at the lowest point before the next peak, so the loop
+    # only compares and divides once per peak instead of once per point.
+    peak = trough = equity_curve[0]
     max_dd = 0.0
     for value in equity_curve:
         if value > peak:
-            peak = value
-        dd = (peak - value) / peak if peak > 0 else 0.0
-        if dd > max_dd:
-            max_dd = dd
+            if peak > 0 and (peak - trough) / peak > max_dd:
+                max_dd = (peak - trough) / peak
+            peak = trough = value
+        elif value < trough:
+            trough = value
+    if peak > 0 and (peak - trough) / peak > max_dd:
+        max_dd = (peak - trough) / peak
     return max_dd * 100.0
 
 
+def _mean_pstdev(values: List[float]) -> Tuple[float, float]:
+    # Float moments: statistics' exact Fraction arithmetic costs several times more and only moves
+    # the last ulp, far below the rounding applied to the reported metrics.
+    if min(values) == max(values):
+        return values[0], 0.0
+    n = len(values)
+    mu = math.fsum(values) / n
+    deviations = [x - mu for x in values]
+    # Subtracting the deviations' own sum corrects for the rounding left in mu.
+    variance = (math.fsum(map(mul, deviations, deviations)) - math.fsum(deviations) ** 2 / n) / n
+    return mu, math.sqrt(max(variance, 0.0))
+
+
+def _compounded_return(returns: List[float]) -> float:
+    # Same left-to-right product as math.prod(1.0 + r), without a generator frame per element.
+    total = 1.0
+    for r in returns:
+        total *= 1.0 + r
+    return total - 1.0
+
+
 def _simple_oos_degradation_pct(returns: List[float]) -> float:
     n = len(returns)
     if n < 20:
@@ -103,8 +199,8 @@ def _simple_oos_degradation_pct(returns: List[float]) -> float:
     split = int(n * 0.8)
     is_returns = returns[:split]
     oos_returns = returns[split:]
-    is_total = math.prod((1.0 + r) for r in is_returns) - 1.0
-    oos_total = math.prod((1.0 + r) for r in oos_returns) - 1.0
+    is_total = _compounded_return(is_returns)
+    oos_total = _compounded_return(oos_returns)
 
     if is_total <= 0:
         return 100.0
@@ -122,13 +218,16 @@ def _segment_metrics(segment_returns: List[float], bars_per_year: int) -> dict:
             "max_drawdown_pct": 0.0,
         }
 
-    total_return = (math.prod((1.0 + r) for r in segment_returns) - 1.0) * 100.0
-    std = pstdev(segment_returns) if len(segment_returns) > 1 else 0.0
-    sharpe = (mean(segment_returns) / std) * math.sqrt(bars_per_year) if std > 0 else 0.0
+    avg, std = _mean_pstdev(segment_returns)
+    sharpe = (avg / std) * math.sqrt(bars_per_year) if std > 0 else 0.0
 
     equity = [1.0]
+    value = 1.0
     for r in segment_returns:
-        equity.append(equity[-1] * (1.0 + r))
+        value *= 1.0 + r
+        equity.append(value)
+    # The curve's last point is the compounded product, so the total return needs no second pass.
+    total_return = (value - 1.0) * 100.0
     max_dd = _max_drawdown_pct(equity)
 
     return {
@@ -210,10 +309,10 @@ def _walk_forward_analysis(
             "windows_count": 0,
         }
 
-    avg_is = mean(w["is"]["total_return_pct"] for w in windows)
-    avg_val = mean(w["validation"]["total_return_pct"] for w in windows)
-    avg_oos = mean(w["oos"]["total_return_pct"] for w in windows)
-    avg_deg = mean(w["oos_degradation_pct"] for w in windows)
+    avg_is = math.fsum(w["is"]["total_return_pct"] for w in windows) / len(windows)
+    avg_val = math.fsum(w["validation"]["total_return_pct"] for w in windows) / len(windows)
+    avg_oos = math.fsum(w["oos"]["total_return_pct"] for w in windows) / len(windows)
+    avg_deg = math.fsum(w["oos_degradation_pct"] for w in windows) / len(windows)
     oos_positive_rate = (
         sum(1 for w in windows if w["oos"]["total_return_pct"] > 0) / len(windows)
     ) * 100.0
@@ -325,7 +424,8 @@ def run_real_backtest(
         if dataset_path.is_absolute() and ROOT in dataset_path.parents
         else str(dataset_path)
     )
-    bars = _load_ohlc_bars(dataset_path)
+    columns = _load_ohlc_columns(dataset_path)
+    bars = _bars_from_columns(columns)
     if len(bars) < 12:
         return (
             Metrics(
@@ -343,6 +443,7 @@ def run_real_backtest(
 
     params = strategy.normalize_params(params=params, bars_count=len(bars))
     indicators = strategy.prepare_indicators(bars=bars, params=params)
+    signals = strategy.signal_series(indicators)
 
     timeframe = dataset_path.parent.parent.name if dataset_path.parent.name == "download" else dataset_path.parent.name
     market = dataset_path.parent.parent.parent.parent.name if dataset_path.parent.name == "download" else "unknown"
@@ -363,12 +464,62 @@ def run_real_backtest(
     equity_curve = [equity]
     returns = []
 
-    for i in range(1, len(bars)):
-        prev_close = bars[i - 1]["close"]
-        close = bars[i]["close"]
-        high = bars[i]["high"]
-        low = bars[i]["low"]
-        ts = bars[i]["timestamp"]
+    # With a precomputed signal series, flat bars without an entry signal have a zero return and
+    # touch nothing else, so the loop jumps straight to the next bar that carries a signal.
+    signal_bars = [i for i, signal in enumerate(signals) if signal] if signals is not None else None
+    # Stops and takes that stay where risk_levels put them let an open position skip ahead to its
+    # next exit candidate too: the first stop/take touch or the first opposite signal.
+    fixed_levels = signal_bars is not None and (
+        type(strategy).update_risk_levels is BaseBotStrategy.update_risk_levels
+    )
+    if fixed_levels:
+        flip_bars = {
+            1: [i for i in signal_bars if signals[i] < 0],
+            -1: [i for i in signal_bars if signals[i] > 0],
+        }
+
+    closes = columns["close"]
+    highs = columns["high"]
+    lows = columns["low"]
+    timestamps = columns["timestamp"]
+
+    i = 1
+    while i < len(bars):
+        if position == 0 and signal_bars is not None and not signals[i]:
+            next_pos = bisect_right(signal_bars, i)
+            next_signal = signal_bars[next_pos] if next_pos < len(signal_bars) else len(bars)
+            returns.extend([0.0] * (next_signal - i))
+            equity_curve.extend([equity] * (next_signal - i))
+            i = next_signal
+            continue
+
+        if position != 0 and fixed_levels and stop_price is not None and take_price is not None:
+            against = flip_bars[position]
+            next_pos = bisect_right(against, i - 1)
+            end = against[next_pos] if next_pos < len(against) else len(bars)
+            j = i
+            if position == 1:
+                while j < end and stop_price < lows[j] and highs[j] < take_price:
+                    j += 1
+            else:
+                while j < end and highs[j] < stop_price and take_price < lows[j]:
+                    j += 1
+            if j > i:
+                held = [
+                    0.0 + position * ((close / prev_close) - 1.0)
+                    for prev_close, close in zip(closes[i - 1 : j - 1], closes[i:j])
+                ]
+                returns.extend(held)
+                equity_curve.extend(islice(accumulate(held, _grow, initial=equity), 1, None))
+                equity = equity_curve[-1]
+                i = j
+                continue
+
+        prev_close = closes[i - 1]
+        close = closes[i]
+        high = highs[i]
+        low = lows[i]
+        ts = timestamps[i]
 
         bar_ret = 0.0
 
@@ -425,7 +576,11 @@ def run_real_backtest(
                 open_trade = None
             else:
                 bar_ret += position * ((close / prev_close) - 1.0)
-                if strategy.should_flip(i=i, position=position, bars=bars, indicators=indicators):
+                if signals is not None:
+                    flip = position * signals[i] < 0
+                else:
+                    flip = strategy.should_flip(i=i, position=position, bars=bars, indicators=indicators)
+                if flip:
                     bar_ret -= per_trade_cost
                     if open_trade:
                         trade_log.append(
@@ -444,7 +599,10 @@ def run_real_backtest(
                     open_trade = None
 
         if position == 0:
-            side = strategy.entry_signal(i=i, bars=bars, indicators=indicators)
+            if signals is not None:
+                side = signals[i]
+            else:
+                side = strategy.entry_signal(i=i, bars=bars, indicators=indicators)
             if side in (-1, 1):
                 entry_price = close
                 stop_price, take_price = strategy.risk_levels(
@@ -468,12 +626,13 @@ def run_real_backtest(
         equity *= (1.0 + bar_ret)
         returns.append(bar_ret)
         equity_curve.append(equity)
+        i += 1
 
     total_return = (equity - 1.0) * 100.0
     max_dd = _max_drawdown_pct(equity_curve)
 
-    returns_std = pstdev(returns) if len(returns) > 1 else 0.0
-    sharpe = (mean(returns) / returns_std) * math.sqrt(_bars_per_year(timeframe)) if returns_std > 0 else 0.0
+    returns_mean, returns_std = _mean_pstdev(returns)
+    sharpe = (returns_mean / returns_std) * math.sqrt(_bars_per_year(timeframe)) if returns_std > 0 else 0.0
 
     walk_forward = _walk_forward_analysis(returns=returns, bars_per_year=_bars_per_year(timeframe))
     if walk_forward.get("status") == "ok":
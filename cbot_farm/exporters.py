@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from api.json_io import write_bytes_atomic
 from bots import list_strategies
 
 
@@ -585,7 +586,7 @@ def export_campaign_payload(campaign: Dict[str, Any], target: str, out_dir: Path
         ]
         return manifest
 
-    code_path.write_text(code, encoding="utf-8")
+    write_bytes_atomic(code_path, code.encode("utf-8"))
     manifest["files"] = [code_path.name]
     manifest["parity"] = evaluate_export_parity(target=target, contract=contract)
     return manifest
@@ -593,5 +594,5 @@ def export_campaign_payload(campaign: Dict[str, Any], target: str, out_dir: Path
 
 def write_export_manifest(out_dir: Path, target: str, stamp: str, payload: Dict[str, Any]) -> Path:
     manifest_path = out_dir / f"{target}_export_{stamp}.json"
-    manifest_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    write_bytes_atomic(manifest_path, json.dumps(payload, indent=2).encode("utf-8"))
     return manifest_path
@@ -1,3 +1,4 @@
+from itertools import islice
 from typing import List, Optional
 
 
@@ -6,43 +7,52 @@ def ema_series(values: List[float], period: int) -> List[Optional[float]]:
         return [float(v) for v in values]
 
     k = 2.0 / (period + 1.0)
-    out: List[Optional[float]] = [None] * len(values)
     if len(values) < period:
-        return out
+        return [None] * len(values)
 
     seed = sum(values[:period]) / period
-    out[period - 1] = seed
+    out: List[Optional[float]] = [None] * (period - 1)
+    out.append(seed)
     ema_prev = seed
 
-    for idx in range(period, len(values)):
-        ema_prev = values[idx] * k + ema_prev * (1.0 - k)
-        out[idx] = ema_prev
+    # The recurrence is inherently sequential; keep the loop body to one multiply-add on locals.
+    decay = 1.0 - k
+    append = out.append
+    for value in islice(values, period, None):
+        ema_prev = value * k + ema_prev * decay
+        append(ema_prev)
     return out
 
 
 def atr_series(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> List[Optional[float]]:
-    trs: List[float] = []
-    for i in range(len(closes)):
-        if i == 0:
-            tr = highs[i] - lows[i]
-        else:
-            tr = max(
-                highs[i] - lows[i],
-                abs(highs[i] - closes[i - 1]),
-                abs(lows[i] - closes[i - 1]),
-            )
-        trs.append(tr)
+    if not closes:
+        return []
+    # True range: the first bar has no previous close, later bars take the widest of the three gaps.
+    # The max is spelled out as compares; a max() call per bar costs twice as much.
+    trs: List[float] = [highs[0] - lows[0]]
+    append_tr = trs.append
+    for high, low, prev_close in zip(islice(highs, 1, len(closes)), islice(lows, 1, len(closes)), closes):
+        tr = high - low
+        gap = abs(high - prev_close)
+        if gap > tr:
+            tr = gap
+        gap = abs(low - prev_close)
+        if gap > tr:
+            tr = gap
+        append_tr(tr)
 
-    atr: List[Optional[float]] = [None] * len(closes)
     if len(closes) < period:
-        return atr
+        return [None] * len(closes)
 
     seed = sum(trs[:period]) / period
-    atr[period - 1] = seed
+    atr: List[Optional[float]] = [None] * (period - 1)
+    atr.append(seed)
     prev = seed
-    for i in range(period, len(closes)):
-        prev = ((prev * (period - 1)) + trs[i]) / period
-        atr[i] = prev
+    carry = period - 1
+    append = atr.append
+    for tr in islice(trs, period, None):
+        prev = ((prev * carry) + tr) / period
+        append(prev)
     return atr
 
 
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from api.batch_reports import BatchReportService
+from api.campaigns import CampaignStore
+from api.listing_index import ListingIndex
+from cbot_farm.config import REPORTS_DIR
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rebuild the batch/campaign/iteration listing index from disk.")
+    parser.parse_args()
+
+    index = ListingIndex(db_path=REPORTS_DIR / "index" / "listings.db")
+    index.clear()
+
+    batches = BatchReportService(reports_root=REPORTS_DIR, index=index).list_batches(limit=1)["total"]
+    store = CampaignStore(campaigns_root=REPORTS_DIR / "campaigns", index=index)
+    campaigns = store.list_campaigns(limit=1)["total"]
+
+    iterations = 0
+    for item in store.list_campaigns(limit=max(campaigns, 1))["items"]:
+        try:
+            iterations += store.list_iterations(str(item["campaign_id"]), limit=1)["total"]
+        except FileNotFoundError:
+            continue
+
+    print(f"batches={batches} campaigns={campaigns} iterations={iterations} db={index.db_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,10 +1,11 @@
 import csv
+import random
 import tempfile
 import unittest
 from pathlib import Path
 
 from bots.base import BaseBotStrategy
-from cbot_farm.backtest import run_real_backtest
+from cbot_farm.backtest import _find_candidate_files, run_real_backtest
 
 
 class RuntimeExitStrategy(BaseBotStrategy):
@@ -45,6 +46,50 @@ class RuntimeExitStrategy(BaseBotStrategy):
         return stop_price, take_price
 
 
+class SignalSeriesStrategy(RuntimeExitStrategy):
+    strategy_id = "signal_series_test"
+    signals = [0, 1, 0, 0, -1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, -1, 0, 0, 0, 0, 0, 0, 0]
+
+    def entry_signal(self, i: int, bars, indicators: dict) -> int:
+        return self.signals[i]
+
+    def should_flip(self, i: int, position: int, bars, indicators: dict) -> bool:
+        return position * self.signals[i] < 0
+
+    def risk_levels(self, i: int, side: int, entry_price: float, bars, indicators: dict, params: dict):
+        return (entry_price - 50.0, entry_price + 50.0) if side == 1 else (entry_price + 50.0, entry_price - 50.0)
+
+    def update_risk_levels(self, i, position, stop_price, take_price, open_trade, bars, indicators, params):
+        return stop_price, take_price
+
+    def signal_series(self, indicators: dict):
+        return self.signals
+
+
+class PerBarSignalStrategy(SignalSeriesStrategy):
+    def signal_series(self, indicators: dict):
+        return None
+
+
+def _random_signals(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [rng.choice((-1, 0, 0, 0, 0, 0, 1)) for _ in range(count)]
+
+
+class TightLevelStrategy(SignalSeriesStrategy):
+    signals = _random_signals(240, seed=7)
+
+    def signal_series(self, indicators: dict):
+        return self.signals
+
+    def risk_levels(self, i: int, side: int, entry_price: float, bars, indicators: dict, params: dict):
+        return (entry_price - 3.0, entry_price + 3.0) if side == 1 else (entry_price + 3.0, entry_price - 3.0)
+
+
+class FixedLevelStrategy(TightLevelStrategy):
+    update_risk_levels = BaseBotStrategy.update_risk_levels
+
+
 class BacktestRuntimeExitTestCase(unittest.TestCase):
     def test_runtime_stop_update_is_applied(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -88,6 +133,92 @@ class BacktestRuntimeExitTestCase(unittest.TestCase):
             self.assertEqual(details["trade_log"][0]["stop_price"], 104.0)
             self.assertLess(metrics.total_return_pct, 0.0)
 
+    def test_signal_series_matches_per_bar_signals(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = Path(tmp_dir) / "indices" / "nas100" / "1h" / "download"
+            csv_path.mkdir(parents=True, exist_ok=True)
+            closes = [100 + (i * 7) % 5 - i * 0.5 for i in range(len(SignalSeriesStrategy.signals))]
+            with (csv_path / "sample.csv").open("w", encoding="utf-8", newline="") as fh:
+                writer = csv.DictWriter(fh, fieldnames=["timestamp", "open", "high", "low", "close"])
+                writer.writeheader()
+                writer.writerows(
+                    {"timestamp": i, "open": close, "high": close + 1, "low": close - 1, "close": close}
+                    for i, close in enumerate(closes)
+                )
+
+            results = [
+                run_real_backtest(
+                    strategy=strategy,
+                    params={},
+                    data_root=Path(tmp_dir),
+                    markets_filter=["indices"],
+                    symbols_filter=["nas100"],
+                    timeframes_filter=["1h"],
+                )
+                for strategy in (SignalSeriesStrategy(), PerBarSignalStrategy())
+            ]
+
+        (fast_metrics, fast_details), (slow_metrics, slow_details) = results
+        self.assertEqual(fast_metrics, slow_metrics)
+        self.assertEqual(fast_details["trade_log"], slow_details["trade_log"])
+        self.assertEqual(fast_details["walk_forward"], slow_details["walk_forward"])
+        self.assertEqual(fast_details["trades_count"], 3)
+
+    def test_fixed_levels_match_per_bar_risk_checks(self) -> None:
+        rng = random.Random(11)
+        closes = [100.0]
+        for _ in range(len(TightLevelStrategy.signals) - 1):
+            closes.append(closes[-1] + rng.uniform(-1.5, 1.5))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = Path(tmp_dir) / "indices" / "nas100" / "1h" / "download"
+            csv_path.mkdir(parents=True, exist_ok=True)
+            with (csv_path / "sample.csv").open("w", encoding="utf-8", newline="") as fh:
+                writer = csv.DictWriter(fh, fieldnames=["timestamp", "open", "high", "low", "close"])
+                writer.writeheader()
+                writer.writerows(
+                    {"timestamp": i, "open": close, "high": close + 1, "low": close - 1, "close": close}
+                    for i, close in enumerate(closes)
+                )
+
+            results = [
+                run_real_backtest(
+                    strategy=strategy,
+                    params={},
+                    data_root=Path(tmp_dir),
+                    markets_filter=["indices"],
+                    symbols_filter=["nas100"],
+                    timeframes_filter=["1h"],
+                )
+                for strategy in (FixedLevelStrategy(), TightLevelStrategy())
+            ]
+
+        (fast_metrics, fast_details), (slow_metrics, slow_details) = results
+        self.assertEqual(fast_metrics, slow_metrics)
+        self.assertEqual(fast_details["trade_log"], slow_details["trade_log"])
+        self.assertEqual(fast_details["walk_forward"], slow_details["walk_forward"])
+        reasons = {trade["exit_reason"] for trade in fast_details["trade_log"]}
+        self.assertEqual(reasons, {"stop_loss", "take_profit", "signal_flip"})
+
+    def test_candidate_files_pick_up_new_datasets(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            first = root / "forex" / "eurusd" / "1h" / "download"
+            first.mkdir(parents=True)
+            (first / "a.csv").write_text("timestamp,open,high,low,close\n", encoding="utf-8")
+            self.assertEqual(_find_candidate_files(root, ["forex"], None, None), [first / "a.csv"])
+
+            # Created below an already listed directory: the root's own mtime does not change.
+            second = root / "forex" / "gbpusd" / "1h" / "download"
+            second.mkdir(parents=True)
+            (second / "b.csv").write_text("timestamp,open,high,low,close\n", encoding="utf-8")
+            self.assertEqual(
+                sorted(_find_candidate_files(root, ["forex"], None, None)),
+                [first / "a.csv", second / "b.csv"],
+            )
+
+            (first / "a.csv").unlink()
+            self.assertEqual(_find_candidate_files(root, ["forex"], None, None), [second / "b.csv"])
+
 
 if __name__ == "__main__":
     unittest.main()
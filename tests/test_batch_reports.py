@@ -64,6 +64,25 @@ class BatchReportServiceTestCase(unittest.TestCase):
         self.assertEqual(item["scenarios"], 1)
         self.assertEqual(item["total_reports"], 100)
 
+    def test_list_batches_reloads_rewritten_summary(self) -> None:
+        first = self.service.list_batches(limit=10, offset=0)
+        self.assertEqual(first["items"][0]["max_retries"], 200)
+
+        summary_path = self.reports_root / "batch_demo_001" / "summary.json"
+        summary = json.loads(summary_path.read_text(encoding="utf-8"))
+        summary["max_retries"] = 50
+        summary_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+        second = self.service.list_batches(limit=10, offset=0)
+        self.assertEqual(second["items"][0]["max_retries"], 50)
+
+    def test_list_batches_filters_by_strategy_case_insensitively(self) -> None:
+        matched = self.service.list_batches(limit=10, offset=0, strategy="EMA_Cross_ATR")
+        self.assertEqual(matched["total"], 1)
+
+        missed = self.service.list_batches(limit=10, offset=0, strategy="supertrend_rsi")
+        self.assertEqual(missed["total"], 0)
+
     def test_get_batch_enriches_best_run(self) -> None:
         out = self.service.get_batch("batch_demo_001")
         self.assertEqual(out["batch_id"], "batch_demo_001")
@@ -74,6 +93,29 @@ class BatchReportServiceTestCase(unittest.TestCase):
         self.assertEqual(scenario["best_trades_count"], 3)
         self.assertGreaterEqual(len(scenario["best_equity_curve"]), 2)
 
+    def test_get_batch_tolerates_non_object_run_report(self) -> None:
+        run_path = self.reports_root / "batch_demo_001" / "EURUSD_1h" / "run_20260220_101055_60.json"
+        run_path.write_text(json.dumps([1, 2, 3]), encoding="utf-8")
+
+        scenario = self.service.get_batch("batch_demo_001")["scenarios"][0]
+        self.assertEqual(scenario["best_run_id"], "20260220_101055_60")
+        self.assertIsNone(scenario["best_trades_count"])
+        self.assertEqual(scenario["best_equity_curve"], [])
+
+    def test_equity_curve_downsampling_keeps_endpoints_and_extremes(self) -> None:
+        trade_log = [{"net_pnl_pct": 0.1} for _ in range(1000)]
+        trade_log[500] = {"net_pnl_pct": -40.0}
+
+        curve = self.service._equity_curve_from_trade_log(trade_log, max_points=120)
+        self.assertEqual(len(curve), 120)
+        self.assertEqual(curve[0]["x"], 1.0)
+        self.assertEqual(curve[-1]["x"], 1000.0)
+        self.assertIn(501.0, [point["x"] for point in curve])
+
+        for max_points, expected in ((2, [1.0, 1000.0]), (1, [1.0]), (0, [])):
+            curve = self.service._equity_curve_from_trade_log(trade_log, max_points=max_points)
+            self.assertEqual([point["x"] for point in curve], expected)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,12 @@
 import json
+import os
 import tempfile
 import unittest
+from datetime import datetime, timezone
 from pathlib import Path
 
-from api.campaigns import CampaignOrchestrator, CampaignStore
+import api.campaigns as campaigns_module
+from api.campaigns import CampaignOrchestrator, CampaignStore, _format_utc_now, _iso_utc_from_timestamp
 
 
 class CampaignsTestCase(unittest.TestCase):
@@ -45,6 +48,157 @@ class CampaignsTestCase(unittest.TestCase):
         cancelled = self.orchestrator.cancel(campaign_id, "manual cancel")
         self.assertEqual(cancelled["status"], "cancelled")
 
+    def test_repeated_transition_to_current_state_does_not_rewrite_campaign(self) -> None:
+        campaign = self.orchestrator.create({"name": "idle"})
+        campaign_id = campaign["campaign_id"]
+        paused = self.orchestrator.pause(campaign_id, "hold")
+        path = self.store.campaign_file(campaign_id)
+        before = path.stat().st_mtime_ns
+
+        again = self.orchestrator.pause(campaign_id, "hold")
+        self.assertEqual(len(again["history"]), len(paused["history"]))
+        self.assertEqual(path.stat().st_mtime_ns, before)
+
+    def test_history_beyond_limit_spills_to_jsonl(self) -> None:
+        campaign = self.orchestrator.create({"name": "chatty"})
+        campaign_id = campaign["campaign_id"]
+        campaign["history"].extend({"event": "note", "seq": idx} for idx in range(600))
+        self.store.save_campaign(campaign)
+
+        stored = self.store.get_campaign(campaign_id)
+        self.assertEqual(len(stored["history"]), 500)
+        self.assertEqual(stored["history"][-1]["seq"], 599)
+        self.assertTrue(self.store.history_file(campaign_id).exists())
+
+        history = self.store.load_history(campaign_id)
+        self.assertEqual(len(history), 602)
+        self.assertEqual(history[0]["event"], "created")
+        self.assertEqual([event["seq"] for event in history[2:]], list(range(600)))
+
+    def test_get_campaign_encoded_reuses_etag_until_campaign_changes(self) -> None:
+        campaign = self.orchestrator.create({"name": "cached"})
+        campaign_id = campaign["campaign_id"]
+
+        body, etag = self.store.get_campaign_encoded(campaign_id)
+        self.assertEqual(json.loads(body), self.store.get_campaign(campaign_id))
+        self.assertEqual(self.store.get_campaign_encoded(campaign_id), (body, etag))
+
+        self.orchestrator.pause(campaign_id, "hold")
+        paused_body, paused_etag = self.store.get_campaign_encoded(campaign_id)
+        self.assertNotEqual(paused_etag, etag)
+        self.assertEqual(json.loads(paused_body)["status"], "paused")
+
+        with self.assertRaises(FileNotFoundError):
+            self.store.get_campaign_encoded("missing")
+
+    def test_fast_timestamps_match_datetime_isoformat(self) -> None:
+        for value in (0.0, 1.0, 1700000000.0000005, 1700000000.9999996, 1773755657.123456, 1773755657.5):
+            expected = datetime.fromtimestamp(value, tz=timezone.utc).isoformat()
+            self.assertEqual(_iso_utc_from_timestamp(value), expected)
+
+        parsed = datetime.fromisoformat(_format_utc_now())
+        self.assertEqual(parsed.utcoffset().total_seconds(), 0)
+
+    def test_iter_campaign_summaries_matches_listing(self) -> None:
+        first = self.orchestrator.create({"name": "first"})
+        self.orchestrator.create({"name": "second"})
+        self.orchestrator.pause(first["campaign_id"], "hold")
+
+        streamed = list(self.store.iter_campaign_summaries())
+        self.assertEqual(streamed, self.store.list_campaigns(limit=10)["items"])
+        paused = list(self.store.iter_campaign_summaries(status="PAUSED"))
+        self.assertEqual([row["campaign_id"] for row in paused], [first["campaign_id"]])
+
+    def test_save_iteration_skips_identical_payload_and_leaves_no_temp_files(self) -> None:
+        campaign = self.orchestrator.create({"name": "atomic-save"})
+        campaign_id = campaign["campaign_id"]
+        iteration = self.orchestrator.register_iteration_stub(campaign_id, "first")
+
+        iter_path = self.store.iterations_dir(campaign_id) / f"{iteration['iteration_id']}.json"
+        before = iter_path.stat().st_mtime_ns
+        self.store.save_iteration(campaign_id, iteration["iteration_id"], iteration)
+        self.assertEqual(iter_path.stat().st_mtime_ns, before)
+
+        campaign_dir = self.store.campaign_dir(campaign_id)
+        self.assertEqual(list(campaign_dir.rglob("*.tmp")), [])
+
+    def test_get_campaign_returns_independent_copies_and_sees_external_edits(self) -> None:
+        campaign = self.orchestrator.create({"name": "cached"})
+        campaign_id = campaign["campaign_id"]
+
+        first = self.store.get_campaign(campaign_id)
+        first["name"] = "mutated"
+        self.assertEqual(self.store.get_campaign(campaign_id)["name"], "cached")
+
+        path = self.store.campaign_file(campaign_id)
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload["name"] = "edited-on-disk"
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        self.assertEqual(self.store.get_campaign(campaign_id)["name"], "edited-on-disk")
+
+    def test_get_iteration_returns_independent_copies_and_sees_external_edits(self) -> None:
+        campaign = self.orchestrator.create({"name": "cached-iteration"})
+        campaign_id = campaign["campaign_id"]
+        iteration_id = self.orchestrator.register_iteration_stub(campaign_id, "first")["iteration_id"]
+
+        loaded = self.store.get_iteration(campaign_id, iteration_id)
+        loaded["summary"] = "mutated"
+        self.assertEqual(self.store.get_iteration(campaign_id, iteration_id)["summary"], "first")
+
+        path = self.store.iteration_file(campaign_id, iteration_id)
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload["summary"] = "edited-on-disk"
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        self.assertEqual(self.store.get_iteration(campaign_id, iteration_id)["summary"], "edited-on-disk")
+
+        with self.assertRaises(FileNotFoundError):
+            self.store.get_iteration(campaign_id, "iter_9999")
+
+    def test_json_cache_evicts_least_recently_used_files(self) -> None:
+        limit = campaigns_module._JSON_CACHE_LIMIT
+        campaigns_module._JSON_CACHE_LIMIT = 2
+        self.addCleanup(setattr, campaigns_module, "_JSON_CACHE_LIMIT", limit)
+
+        ids = [self.orchestrator.create({"name": f"bounded-{i}"})["campaign_id"] for i in range(3)]
+        self.store.get_campaign(ids[1])
+        self.store.get_campaign(ids[2])
+
+        self.assertEqual(len(self.store._json_cache), 2)
+        self.assertNotIn(self.store.campaign_file(ids[0]), self.store._json_cache)
+        self.assertEqual(self.store.get_campaign(ids[0])["name"], "bounded-0")
+        self.assertNotIn(self.store.campaign_file(ids[1]), self.store._json_cache)
+
+    def test_list_iterations_pages_without_losing_total(self) -> None:
+        campaign = self.orchestrator.create({"name": "paged"})
+        campaign_id = campaign["campaign_id"]
+        for idx in range(3):
+            self.orchestrator.register_iteration_stub(campaign_id, f"iteration {idx}")
+
+        out = self.store.list_iterations(campaign_id, limit=2, offset=1)
+        self.assertEqual(out["total"], 3)
+        self.assertEqual(len(out["items"]), 2)
+
+        campaigns = self.store.list_campaigns(limit=1, offset=5)
+        self.assertEqual(campaigns["total"], 1)
+        self.assertEqual(campaigns["items"], [])
+
+    def test_list_iterations_pages_follow_newest_first_order(self) -> None:
+        campaign = self.orchestrator.create({"name": "ordered"})
+        campaign_id = campaign["campaign_id"]
+        expected = [
+            self.orchestrator.register_iteration_stub(campaign_id, f"iteration {idx}")["iteration_id"]
+            for idx in range(12)
+        ]
+        for idx, iteration_id in enumerate(expected):
+            path = self.store.iteration_file(campaign_id, iteration_id)
+            os.utime(path, ns=(1_000_000_000 * (idx + 1), 1_000_000_000 * (idx + 1)))
+        expected.reverse()
+
+        out = self.store.list_iterations(campaign_id, limit=10, offset=1)
+        self.assertEqual(out["total"], 12)
+        self.assertEqual([item["iteration_id"] for item in out["items"]], expected[1:11])
+        self.assertEqual(out["items"][0]["summary"], "iteration 10")
+
     def test_export_request_generates_code_artifacts_for_supported_strategy(self) -> None:
         campaign = self.orchestrator.create(
             {
@@ -131,6 +285,19 @@ class CampaignsTestCase(unittest.TestCase):
         self.assertEqual(loaded["stats"]["best_iteration"], iteration["iteration_id"])
         self.assertIsNotNone(loaded["stats"]["best_score"])
 
+    def test_evaluate_metrics_batch_matches_single_evaluation(self) -> None:
+        gates = {"max_drawdown_pct": 10, "min_sharpe": 1.0, "max_oos_degradation_pct": 25}
+        candidates = [
+            {"total_return_pct": 12.0, "sharpe": 1.4, "max_drawdown_pct": 8.0, "oos_degradation_pct": 10.0},
+            {"total_return_pct": -5.0, "sharpe": "0.3", "max_drawdown_pct": 0.0},
+            {},
+        ]
+
+        batch = self.orchestrator._evaluate_metrics_batch(candidates, gates)
+        single = [self.orchestrator._evaluate_metrics(metrics=m, gates=gates) for m in candidates]
+        self.assertEqual(batch, single)
+        self.assertTrue(batch[0]["pass"]["all"])
+
     def test_evaluate_iteration_can_trigger_reject_stop(self) -> None:
         campaign = self.orchestrator.create(
             {
@@ -187,6 +354,10 @@ class CampaignsTestCase(unittest.TestCase):
         self.assertTrue(any(p.startswith("artifacts/evaluation_iter_") for p in artifact_paths))
         self.assertTrue(any(p.startswith("artifacts/critic_iter_") for p in artifact_paths))
 
+        iteration = self.store.get_iteration(campaign_id, out["iteration"]["iteration_id"])
+        self.assertEqual(iteration["created_at"], iteration["evaluated_at"])
+        self.assertEqual(iteration["created_at"], out["critic"]["created_at"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,7 @@
+import math
 import unittest
 
-from bots.ema_cross_atr import EmaCrossAtrBot
+from bots.ema_cross_atr import EmaCrossAtrBot, _signal_at
 
 
 class EmaCrossAtrBotTestCase(unittest.TestCase):
@@ -60,6 +61,34 @@ class EmaCrossAtrBotTestCase(unittest.TestCase):
         pass_all["atr"] = [None, 1.5, 1.5]
         self.assertEqual(self.bot.entry_signal(2, bars, pass_all), 1)
 
+    def test_prepare_indicators_reuses_series_for_same_bars(self) -> None:
+        bars = [{"close": 1.0 + i * 0.01, "high": 1.01 + i * 0.01, "low": 0.99 + i * 0.01} for i in range(120)]
+        params = self.bot.normalize_params(self.bot.sample_params(1), bars_count=len(bars))
+        first = self.bot.prepare_indicators(bars, params)
+
+        second = self.bot.prepare_indicators(bars, self.bot.normalize_params(self.bot.sample_params(2), len(bars)))
+        self.assertIs(second["ema_fast"], first["ema_fast"])
+        self.assertIs(second["atr_avg"], first["atr_avg"])
+        self.assertNotEqual(second["entry_filters"], first["entry_filters"])
+
+        shifted = [dict(bar, close=bar["close"] + 1.0) for bar in bars]
+        third = self.bot.prepare_indicators(shifted, params)
+        self.assertIsNot(third["ema_fast"], first["ema_fast"])
+        self.assertGreater(third["ema_fast"][-1], first["ema_fast"][-1])
+
+    def test_precomputed_signals_match_per_bar_rule(self) -> None:
+        closes = [1.0 + 0.1 * math.sin(i / 6.0) for i in range(200)]
+        bars = [{"close": close, "high": close + 0.01, "low": close - 0.01} for close in closes]
+        params = self.bot.normalize_params(self.bot.sample_params(3), bars_count=len(bars))
+        params.update({"ema_fast": 3, "ema_slow": 8, "atr_period": 5, "rsi_period": 3, "atr_vol_window": 5})
+        indicators = self.bot.prepare_indicators(bars, params)
+
+        expected = [_signal_at(i, indicators) for i in range(len(bars))]
+        self.assertEqual(indicators["signals"], expected)
+        self.assertIn(1, expected)
+        self.assertIn(-1, expected)
+        self.assertIs(self.bot.signal_series(indicators), indicators["signals"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,34 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from api.json_io import read_json, write_json
+
+
+class JsonIoTestCase(unittest.TestCase):
+    def test_concurrent_atomic_writes_to_one_path(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "campaign.json"
+            errors = []
+
+            def writer(worker: int) -> None:
+                for i in range(100):
+                    try:
+                        write_json(path, {"worker": worker, "i": i, "pad": "x" * 4096})
+                    except Exception as exc:  # pragma: no cover - reported through the assertion below
+                        errors.append(exc)
+
+            threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(errors, [])
+            self.assertEqual(read_json(path)["i"], 99)
+            self.assertEqual([p.name for p in Path(tmp_dir).iterdir()], ["campaign.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from api.batch_reports import BatchReportService
+from api.campaigns import CampaignOrchestrator, CampaignStore
+from api.listing_index import ListingIndex
+
+
+class ListingIndexTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+        root = Path(self._tmp.name)
+        self.reports_root = root / "reports"
+        self.index = ListingIndex(db_path=root / "index" / "listings.db")
+        self.addCleanup(self.index.engine.dispose)
+
+        for batch_id, strategy in (("batch_a", "ema_cross_atr"), ("batch_b", "supertrend_rsi")):
+            batch_dir = self.reports_root / batch_id
+            batch_dir.mkdir(parents=True, exist_ok=True)
+            summary = {
+                "batch_id": batch_id,
+                "strategy": strategy,
+                "max_retries": 10,
+                "scenarios": [{"name": "EURUSD_1h", "reports": 5, "promoted_count": 1}],
+            }
+            (batch_dir / "summary.json").write_text(json.dumps(summary), encoding="utf-8")
+
+        self.store = CampaignStore(campaigns_root=self.reports_root / "campaigns", index=self.index)
+        self.orchestrator = CampaignOrchestrator(store=self.store)
+
+    def test_indexed_batches_match_directory_scan(self) -> None:
+        plain = BatchReportService(reports_root=self.reports_root)
+        indexed = BatchReportService(reports_root=self.reports_root, index=self.index)
+
+        self.assertEqual(indexed.list_batches(), plain.list_batches())
+        filtered = indexed.list_batches(strategy="EMA_CROSS_ATR")
+        self.assertEqual(filtered["total"], 1)
+        self.assertEqual(filtered["items"][0]["batch_id"], "batch_a")
+
+    def test_indexed_batches_follow_rewrites_and_deletions(self) -> None:
+        service = BatchReportService(reports_root=self.reports_root, index=self.index)
+        self.assertEqual(service.list_batches()["total"], 2)
+
+        summary_path = self.reports_root / "batch_a" / "summary.json"
+        summary = json.loads(summary_path.read_text(encoding="utf-8"))
+        summary["max_retries"] = 99
+        summary_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        (self.reports_root / "batch_b" / "summary.json").unlink()
+
+        out = service.list_batches()
+        self.assertEqual(out["total"], 1)
+        self.assertEqual(out["items"][0]["max_retries"], 99)
+
+    def test_indexed_campaigns_and_iterations_match_directory_scan(self) -> None:
+        campaign = self.orchestrator.create({"name": "indexed"})
+        campaign_id = campaign["campaign_id"]
+        self.orchestrator.register_iteration_stub(campaign_id, "first")
+        self.orchestrator.pause(campaign_id, "hold")
+
+        plain = CampaignStore(campaigns_root=self.store.campaigns_root)
+        self.assertEqual(self.store.list_campaigns(), plain.list_campaigns())
+        self.assertEqual(self.store.list_campaigns(status="PAUSED")["total"], 1)
+        self.assertEqual(self.store.list_campaigns(status="completed")["total"], 0)
+        self.assertEqual(self.store.list_iterations(campaign_id), plain.list_iterations(campaign_id))
+
+    def test_indexed_campaigns_reconcile_files_written_before_the_index(self) -> None:
+        plain = CampaignStore(campaigns_root=self.store.campaigns_root)
+        CampaignOrchestrator(store=plain).create({"name": "pre-existing"})
+
+        indexed = CampaignStore(campaigns_root=self.store.campaigns_root, index=self.index)
+        self.assertEqual(indexed.list_campaigns()["total"], 1)
+
+        CampaignOrchestrator(store=indexed).create({"name": "after-startup"})
+        out = indexed.list_campaigns()
+        self.assertEqual(out["total"], 2)
+        self.assertEqual(out["items"][0]["name"], "after-startup")
+
+    def test_indexed_campaigns_follow_external_edits_and_deletions(self) -> None:
+        first = self.orchestrator.create({"name": "kept"})["campaign_id"]
+        second = self.orchestrator.create({"name": "removed"})["campaign_id"]
+        self.assertEqual(self.store.list_campaigns()["total"], 2)
+
+        path = self.store.campaign_file(first)
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload["name"] = "edited-on-disk"
+        path.write_text(json.dumps(payload, indent=4), encoding="utf-8")
+        self.store.campaign_file(second).unlink()
+
+        out = self.store.list_campaigns()
+        self.assertEqual(out["total"], 1)
+        self.assertEqual(out["items"][0]["name"], "edited-on-disk")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from bots.momentum_rider import MomentumRiderBot
@@ -98,6 +99,27 @@ class MomentumRiderBotTestCase(unittest.TestCase):
         fail_zero_line["macd_hist"] = [-0.05, -0.05, 0.01]
         self.assertEqual(self.bot.entry_signal(2, bars, fail_zero_line), 0)
 
+    def test_macd_cross_mask_matches_per_bar_entries(self) -> None:
+        rnd = random.Random(1)
+        closes = [100.0]
+        for _ in range(399):
+            closes.append(closes[-1] + rnd.gauss(0, 1))
+        bars = [{"close": c, "high": c + 0.5, "low": c - 0.5, "timestamp": i} for i, c in enumerate(closes)]
+        params = self.bot.normalize_params(self.bot.sample_params(1), bars_count=len(bars))
+        params.update({"rsi_gate": 50, "min_adx": 10, "atr_vol_ratio_max": 3.0})
+        indicators = self.bot.prepare_indicators(bars, params)
+
+        self.assertIn(1, indicators["macd_cross"])
+        self.assertIn(-1, indicators["macd_cross"])
+        without_mask = {key: value for key, value in indicators.items() if key != "macd_cross"}
+        expected = [self.bot.entry_signal(i, bars, without_mask) for i in range(len(bars))]
+        self.assertEqual([self.bot.entry_signal(i, bars, indicators) for i in range(len(bars))], expected)
+        self.assertIn(1, expected)
+        self.assertIn(-1, expected)
+        for signal, cross in zip(expected, indicators["macd_cross"]):
+            if signal:
+                self.assertEqual(signal, cross)
+
 
 if __name__ == "__main__":
     unittest.main()
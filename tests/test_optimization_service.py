@@ -90,6 +90,25 @@ class OptimizationServiceTestCase(unittest.TestCase):
         persisted = self.service.get_space("demo_strategy")
         self.assertEqual(persisted["preview"]["total_candidates"], 3)
 
+    def test_external_edit_to_risk_config_is_picked_up(self) -> None:
+        self.assertEqual(self.service.list_spaces()["total"], 1)
+
+        payload = json.loads(self.risk_path.read_text(encoding="utf-8"))
+        payload["optimization"]["parameter_space"]["second_strategy"] = {"parameters": {}}
+        self.risk_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+        listed = self.service.list_spaces()
+        self.assertEqual([item["strategy_id"] for item in listed["items"]], ["demo_strategy", "second_strategy"])
+
+    def test_get_space_returns_plain_copy_of_cached_config(self) -> None:
+        detail = self.service.get_space("demo_strategy")
+        detail["space"]["parameters"]["ema_fast"]["max"] = 99
+        self.assertEqual(json.loads(json.dumps(detail))["space"]["parameters"]["ema_fast"]["max"], 99)
+
+        again = self.service.get_space("demo_strategy")
+        self.assertEqual(again["space"]["parameters"]["ema_fast"]["max"], 7)
+        self.assertEqual(again["preview"]["total_candidates"], 3)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -121,6 +121,61 @@ class ReportIndexServiceTestCase(unittest.TestCase):
         self.assertEqual(narrowed["total"], 1)
         self.assertEqual(narrowed["items"][0]["strategy_id"], "s1")
 
+    def test_rebuild_accepts_stdlib_nan_metrics(self) -> None:
+        run_3 = {
+            "created_at": "2026-02-19T00:00:00+00:00",
+            "strategy_id": "s3",
+            "market": "forex",
+            "status": "ok",
+            "metrics": {"total_return_pct": 0.0, "sharpe": float("nan")},
+        }
+        (self.reports_root / "run_20260217_000003_1.json").write_text(json.dumps(run_3), encoding="utf-8")
+
+        summary = self.index.rebuild()
+        self.assertEqual(summary["runs_indexed"], 3)
+        latest = self.index.list_runs(limit=1, offset=0)["items"][0]
+        self.assertEqual(latest["strategy_id"], "s3")
+
+    def test_rebuild_only_reparses_changed_files(self) -> None:
+        first = self.index.rebuild()
+        self.assertEqual(first["runs_reindexed"], 2)
+
+        unchanged = self.index.rebuild()
+        self.assertEqual(unchanged["runs_reindexed"], 0)
+        self.assertEqual(unchanged["manifests_reindexed"], 0)
+
+        run_1_path = self.reports_root / "run_20260217_000001_1.json"
+        run_1 = json.loads(run_1_path.read_text(encoding="utf-8"))
+        run_1["market"] = "crypto"
+        run_1_path.write_text(json.dumps(run_1), encoding="utf-8")
+        (self.reports_root / "run_20260217_000002_1.json").unlink()
+
+        changed = self.index.rebuild()
+        self.assertEqual(changed["runs_indexed"], 1)
+        self.assertEqual(changed["runs_reindexed"], 1)
+        self.assertEqual(changed["files_removed"], 1)
+
+        runs = self.index.list_runs(limit=10, offset=0)
+        self.assertEqual(runs["total"], 1)
+        self.assertEqual(runs["items"][0]["market"], "crypto")
+        self.assertEqual(self.index.list_ingest_manifests(limit=10, offset=0)["total"], 1)
+
+        forced = self.index.rebuild(full=True)
+        self.assertEqual(forced["runs_reindexed"], 1)
+        self.assertEqual(forced["manifests_reindexed"], 1)
+
+    def test_outdated_schema_is_rebuilt_from_reports(self) -> None:
+        self.index.rebuild()
+        with self.index.engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA user_version=0")
+            connection.commit()
+
+        reopened = ReportIndexService(reports_root=self.reports_root, db_path=self.index.db_path)
+        self.assertEqual(reopened.status()["runs_count"], 0)
+        self.assertEqual(reopened.rebuild()["runs_reindexed"], 2)
+        runs = reopened.list_runs(limit=10, offset=0)
+        self.assertEqual([r["run_id"] for r in runs["items"]], ["run_20260217_000002_1", "run_20260217_000001_1"])
+
     def test_list_ingest_manifests(self) -> None:
         self.index.rebuild()
         manifests = self.index.list_ingest_manifests(limit=10, offset=0)
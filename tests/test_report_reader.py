@@ -1,8 +1,11 @@
 import json
+import os
 import tempfile
 import unittest
 from pathlib import Path
 
+from api.report_index import ReportIndexService
+import api.report_reader as report_reader_module
 from api.report_reader import ReportReader
 
 
@@ -68,6 +71,30 @@ class ReportReaderTestCase(unittest.TestCase):
         self.assertEqual(filtered["total"], 1)
         self.assertEqual(filtered["items"][0]["run_id"], "run_20260217_000001_1")
 
+    def test_unfiltered_list_pages_newest_first(self) -> None:
+        os.utime(self.reports_root / "run_20260217_000001_1.json", (2_000_000_000, 2_000_000_000))
+
+        first = self.reader.list_runs(limit=1, offset=0)
+        self.assertEqual(first["total"], 2)
+        self.assertEqual([r["run_id"] for r in first["items"]], ["run_20260217_000001_1"])
+
+        second = self.reader.list_runs(limit=1, offset=1)
+        self.assertEqual(second["total"], 2)
+        self.assertEqual([r["run_id"] for r in second["items"]], ["run_20260217_000002_1"])
+        self.assertEqual(second["items"][0]["metrics"], {"sharpe": 1.5})
+
+    def test_list_runs_uses_index_when_current(self) -> None:
+        index = ReportIndexService(reports_root=self.reports_root, db_path=self.reports_root / "index" / "reports.db")
+        reader = ReportReader(reports_root=self.reports_root, index=index)
+        # An empty index is not ready, so the files are scanned.
+        self.assertIn("external_run_id", reader.list_runs(limit=10, offset=0)["items"][0])
+
+        index.rebuild()
+        forex_runs = reader.list_runs(limit=10, offset=0, market="forex")
+        self.assertEqual(forex_runs["total"], 1)
+        self.assertNotIn("external_run_id", forex_runs["items"][0])
+        self.assertEqual(reader.list_ingest_manifests(limit=10, offset=0)["items"][0]["ok"], 1)
+
     def test_get_run_supports_id_variants(self) -> None:
         by_stem = self.reader.get_run("run_20260217_000001_1")
         self.assertEqual(by_stem["run_id"], "run_20260217_000001_1")
@@ -77,6 +104,29 @@ class ReportReaderTestCase(unittest.TestCase):
         self.assertEqual(by_raw["run_id"], "run_20260217_000001_1")
         self.assertIn("schema_version", by_raw["payload"])
 
+    def test_get_run_rereads_rewritten_report(self) -> None:
+        path = self.reports_root / "run_20260217_000001_1.json"
+        first = self.reader.get_run("run_20260217_000001_1")
+        first["payload"]["symbol"] = "mutated"
+        self.assertEqual(self.reader.get_run("run_20260217_000001_1")["payload"]["symbol"], "GER40")
+
+        payload = json.loads(path.read_text())
+        payload["symbol"] = "NAS100"
+        path.write_text(json.dumps(payload, indent=2))
+        self.assertEqual(self.reader.get_run("run_20260217_000001_1")["payload"]["symbol"], "NAS100")
+
+    def test_get_run_parses_oversized_reports_without_caching(self) -> None:
+        limit = report_reader_module._DETAIL_CACHE_MAX_BYTES
+        report_reader_module._DETAIL_CACHE_MAX_BYTES = 16
+        self.addCleanup(setattr, report_reader_module, "_DETAIL_CACHE_MAX_BYTES", limit)
+        report_reader_module._load_detail_cached.cache_clear()
+
+        first = self.reader.get_run("run_20260217_000001_1")
+        second = self.reader.get_run("run_20260217_000001_1")
+        self.assertEqual(first, second)
+        self.assertIsNot(first["payload"]["backtest"], second["payload"]["backtest"])
+        self.assertEqual(report_reader_module._load_detail_cached.cache_info().currsize, 0)
+
     def test_ingest_manifest_list_and_detail(self) -> None:
         manifests = self.reader.list_ingest_manifests(limit=10, offset=0)
         self.assertEqual(manifests["total"], 1)
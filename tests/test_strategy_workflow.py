@@ -3,6 +3,7 @@ import tempfile
 import unittest
 from pathlib import Path
 
+from api.json_io import write_json
 from api.strategy_workflow import StrategyWorkflowService
 
 
@@ -35,6 +36,9 @@ class StrategyWorkflowServiceTestCase(unittest.TestCase):
     def test_init_and_board(self) -> None:
         init_payload = self.service.init_from_registry()
         self.assertIn("strategies", init_payload)
+        for item in init_payload["strategies"]:
+            self.assertEqual(item["updated_at"], init_payload["updated_at"])
+            self.assertEqual(item["history"][0]["at"], init_payload["updated_at"])
 
         board = self.service.get_board()
         self.assertIn("states", board)
@@ -55,6 +59,62 @@ class StrategyWorkflowServiceTestCase(unittest.TestCase):
         # Valid path draft -> research.
         updated = self.service.transition("ema_cross_atr", "research", note="start research")
         self.assertEqual(updated["state"], "research")
+        self.assertEqual(updated["updated_at"], updated["history"][-1]["at"])
+
+    def test_board_reads_do_not_rewrite_storage(self) -> None:
+        self.service.get_board()
+        storage = self.reports_root / "strategy_workflow.json"
+        before = storage.stat().st_mtime_ns
+
+        self.service.get_board()
+        self.assertEqual(storage.stat().st_mtime_ns, before)
+
+        payload = json.loads(storage.read_text(encoding="utf-8"))
+        payload["strategies"][0]["state"] = "research"
+        storage.write_text(json.dumps(payload, indent=4), encoding="utf-8")
+        board = self.service.get_board()
+        self.assertEqual(board["items"][0]["state"], "research")
+
+    def test_board_picks_up_rewritten_run_reports(self) -> None:
+        self.service.get_board()
+        board = self.service.get_board()
+        ema = next(x for x in board["items"] if x["strategy_id"] == "ema_cross_atr")
+        self.assertEqual(ema["last_run"]["run_id"], "run_20260220_000001_sim")
+
+        run_path = self.reports_root / "run_20260220_000001_sim.json"
+        payload = json.loads(run_path.read_text(encoding="utf-8"))
+        payload["strategy_id"] = "momentum_rider"
+        write_json(run_path, payload)
+
+        board = self.service.get_board()
+        by_id = {x["strategy_id"]: x for x in board["items"]}
+        self.assertIsNone(by_id["ema_cross_atr"]["last_run"])
+        self.assertEqual(by_id["momentum_rider"]["last_run"]["run_id"], "run_20260220_000001_sim")
+
+    def test_run_summaries_drop_deleted_reports(self) -> None:
+        extra = [self.reports_root / f"run_20260221_00000{i}_sim.json" for i in range(3)]
+        for path in extra:
+            path.write_text(json.dumps({"strategy_id": "unknown_bot", "metrics": {}}), encoding="utf-8")
+        self.service.get_board()
+        self.assertEqual(len(self.service._run_summaries), 4)
+
+        for path in extra:
+            path.unlink()
+        board = self.service.get_board()
+        ema = next(x for x in board["items"] if x["strategy_id"] == "ema_cross_atr")
+        self.assertEqual(ema["last_run"]["run_id"], "run_20260220_000001_sim")
+        self.assertEqual(list(self.service._run_summaries), ["run_20260220_000001_sim.json"])
+
+    def test_board_is_reused_until_transition(self) -> None:
+        self.service.get_board()
+        board = self.service.get_board()
+        self.assertIs(self.service.get_board(), board)
+
+        self.service.transition("ema_cross_atr", "research", note="start research")
+        updated = self.service.get_board()
+        self.assertIsNot(updated, board)
+        ema = next(x for x in updated["items"] if x["strategy_id"] == "ema_cross_atr")
+        self.assertEqual(ema["state"], "research")
 
 
 if __name__ == "__main__":
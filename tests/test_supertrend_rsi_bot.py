@@ -0,0 +1,37 @@
+import unittest
+
+from bots.supertrend_rsi import SuperTrendRsiBot
+
+
+class SuperTrendRsiBotTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.bot = SuperTrendRsiBot()
+
+    def test_prepare_indicators_reuses_series_across_multiplier_sweep(self) -> None:
+        bars = [{"close": 1.0 + i * 0.01, "high": 1.01 + i * 0.01, "low": 0.99 + i * 0.01} for i in range(300)]
+        params = self.bot.normalize_params(
+            {"st_period": 10, "st_mult": 2.0, "rsi_period": 14, "ema_period": 50, "min_adx": 20, "atr_period": 14},
+            bars_count=len(bars),
+        )
+        first = self.bot.prepare_indicators(bars, params)
+
+        second = self.bot.prepare_indicators(bars, dict(params, st_mult=3.0))
+        self.assertIs(second["rsi"], first["rsi"])
+        self.assertIs(second["adx"], first["adx"])
+        self.assertIs(second["ema"], first["ema"])
+        self.assertIs(second["atr"], first["atr"])
+        self.assertIsNot(second["st_up"], first["st_up"])
+        self.assertEqual(
+            sorted(key[0] for key in self.bot._series_cache),
+            ["adx", "atr", "ema", "rsi"],
+        )
+        self.assertIsNot(self.bot.prepare_indicators(bars, params)["st_up"], first["st_up"])
+
+        shifted = [dict(bar, close=bar["close"] + 1.0) for bar in bars]
+        third = self.bot.prepare_indicators(shifted, params)
+        self.assertIsNot(third["ema"], first["ema"])
+        self.assertGreater(third["ema"][-1], first["ema"][-1])
+
+
+if __name__ == "__main__":
+    unittest.main()